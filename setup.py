@@ -1,6 +1,18 @@
 #!/usr/bin/env python3
 
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+
+# The rectangle SAT kernels ship as an optional C extension; without Cython
+# the package installs as pure Python and uses the numba/Python paths
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("surface_optimizer.core._geom", ["surface_optimizer/core/_geom.pyx"],
+                   extra_compile_args=["-O3"])],
+        language_level=3,
+    )
+except ImportError:
+    ext_modules = []
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -15,6 +27,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/gastonfr24/surface-cutting-optimizer",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -0,0 +1,27 @@
+"""
+Compiled geometry primitives shared by the placement algorithms
+
+Kernels are compiled with numba when it is installed. Without numba the
+decorator is a no-op, so the functions still run as plain Python and callers
+can check NUMBA_AVAILABLE to prefer a NumPy path instead.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels stay importable without numba"""
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def aabb_any_overlap(x, y, width, height, occ_x, occ_y, occ_w, occ_h, count):
+    """Check a box against the first count occupied boxes (touching edges are allowed)"""
+    for k in range(count):
+        if (x < occ_x[k] + occ_w[k] and x + width > occ_x[k] and
+                y < occ_y[k] + occ_h[k] and y + height > occ_y[k]):
+            return True
+    return False
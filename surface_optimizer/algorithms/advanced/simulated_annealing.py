@@ -3,11 +3,15 @@ Simulated Annealing Algorithm for Surface Cutting Optimization
 Advanced optimization using simulated annealing metaheuristic
 """
 
-import random
 import copy
 import math
+import logging
+from collections import defaultdict
+from datetime import datetime
 from typing import List, Tuple, Optional, Dict, Any
 
+import numpy as np
+
 from ...core.models import Stock, Order, CuttingResult, OptimizationConfig, PlacedShape
 from ...core.geometry import Rectangle, Circle, Shape
 from ..base import BaseAlgorithm
@@ -17,13 +21,20 @@ from ...utils.logging import get_logger
 class SimulatedAnnealingAlgorithm(BaseAlgorithm):
     """Simulated Annealing with auto-scaling for cutting optimization"""
     
+    # Neighborhood moves, indexed by the pre-drawn move numbers
+    MOVE_TYPES = ("relocate", "swap", "rotate", "reorder")
+    
+    # Moves that keep the placed area, used stocks and unplaced orders intact
+    COST_NEUTRAL_MOVES = frozenset(("rotate", "reorder"))
+    
     def __init__(self, 
                  initial_temperature: Optional[float] = None,
                  cooling_rate: float = 0.95,
                  min_temperature: Optional[float] = None,
                  max_iterations: Optional[int] = None,
                  iterations_per_temp: Optional[int] = None,
-                 auto_scale: bool = True):
+                 auto_scale: bool = True,
+                 seed: Optional[int] = None):
         super().__init__()
         self.name = "Simulated Annealing"
         self.base_initial_temperature = initial_temperature
@@ -34,14 +45,26 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         self.auto_scale = auto_scale
         self.logger = get_logger()
         
+        # Single PCG64 stream drives every random decision, seedable for reproducible runs
+        self._rng = np.random.default_rng(seed)
+        
         # Tracking
         self.temperature_history: List[float] = []
         self.cost_history: List[float] = []
         self.acceptance_history: List[float] = []
         
+        # Stock indices grouped by material, rebuilt on each optimize() call
+        self._stocks_by_material: Dict[Any, List[int]] = defaultdict(list)
+        # Rotatable (rectangle) flag per expanded order, rebuilt on each optimize() call
+        self._is_rect_order: List[bool] = []
+        
         # Performance optimizations
         self.early_stop_patience = 20
         self.convergence_threshold = 1e-6
+        
+        # Acceptance rates outside this band mark uninformative temperature levels
+        self.min_acceptance_rate = 0.05
+        self.max_acceptance_rate = 0.95
     
     def _auto_scale_parameters(self, num_stocks: int, num_orders: int) -> Tuple[float, float, int, int]:
         """Auto-scale parameters based on problem size"""
@@ -73,7 +96,7 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
             max_iter = max(500, int(math.sqrt(problem_size) * 50))
             iter_per_temp = max(30, int(math.sqrt(problem_size) * 5))
         
-        self.logger.logger.debug(f"Auto-scaled SA: temp={initial_temp}, max_iter={max_iter}")
+        self.logger.logger.debug("Auto-scaled SA: temp=%s, max_iter=%s", initial_temp, max_iter)
         return initial_temp, min_temp, max_iter, iter_per_temp
     
     def optimize(self, stocks: List[Stock], orders: List[Order], 
@@ -97,62 +120,103 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
             # Expand orders
             expanded_orders = self._expand_orders(orders)
             
+            # Index compatible stocks once so moves skip mismatched materials
+            self._stocks_by_material = defaultdict(list)
+            for stock_idx, stock in enumerate(stocks):
+                self._stocks_by_material[stock.material_type].append(stock_idx)
+            self._is_rect_order = [isinstance(order.shape, Rectangle) for order in expanded_orders]
+            
             # Generate initial solution
             current_solution = self._generate_initial_solution(stocks, expanded_orders, config)
             current_cost = self._evaluate_solution(current_solution, stocks, expanded_orders, config)
             
-            # Best solution tracking
-            best_solution = copy.deepcopy(current_solution)
+            # Best solution tracking; placement tuples are immutable, so a
+            # shallow snapshot of the list is enough to rebuild the result
+            best_placements = list(current_solution["placements"])
             best_cost = current_cost
             
             # Annealing process
             temperature = self.initial_temperature
             iteration = 0
+            debug_enabled = self.logger.logger.isEnabledFor(logging.DEBUG)
+            level_iterations = self.iterations_per_temp
+            stagnant_levels = 0
+            stopped_early = False
             
             while temperature > self.min_temperature and iteration < self.max_iterations:
                 
                 accepted_moves = 0
+                level_start_best = best_cost
+                
+                # Pre-draw all randomness for this temperature level
+                move_draws = self._rng.integers(0, len(self.MOVE_TYPES), 
+                                                level_iterations).tolist()
+                pick_draws = self._rng.random((level_iterations, 2)).tolist()
+                accept_draws = self._rng.exponential(1.0, level_iterations).tolist()
                 
-                for _ in range(self.iterations_per_temp):
+                for i in range(level_iterations):
                     iteration += 1
                     
                     # Generate neighbor solution
                     neighbor_solution = self._generate_neighbor(current_solution, stocks, 
-                                                              expanded_orders, config)
-                    neighbor_cost = self._evaluate_solution(neighbor_solution, stocks, 
-                                                           expanded_orders, config)
+                                                              expanded_orders, config,
+                                                              move_draws[i], pick_draws[i])
+                    if self.MOVE_TYPES[move_draws[i]] in self.COST_NEUTRAL_MOVES:
+                        neighbor_cost = current_cost
+                    else:
+                        neighbor_cost = self._evaluate_solution(neighbor_solution, stocks, 
+                                                               expanded_orders, config)
                     
                     # Accept or reject
-                    if self._accept_solution(current_cost, neighbor_cost, temperature):
+                    if self._accept_solution(current_cost, neighbor_cost, temperature,
+                                             accept_draws[i]):
                         current_solution = neighbor_solution
                         current_cost = neighbor_cost
                         accepted_moves += 1
                         
                         # Update best solution
                         if neighbor_cost < best_cost:
-                            best_solution = copy.deepcopy(neighbor_solution)
+                            best_placements = list(neighbor_solution["placements"])
                             best_cost = neighbor_cost
                 
                 # Track statistics
-                acceptance_rate = accepted_moves / self.iterations_per_temp
+                acceptance_rate = accepted_moves / level_iterations
                 self.temperature_history.append(temperature)
                 self.cost_history.append(current_cost)
                 self.acceptance_history.append(acceptance_rate)
                 
+                # Stop once the best cost has stalled for early_stop_patience levels
+                if level_start_best - best_cost < self.convergence_threshold:
+                    stagnant_levels += 1
+                    if stagnant_levels >= self.early_stop_patience:
+                        stopped_early = True
+                        break
+                else:
+                    stagnant_levels = 0
+                
+                # Spend less effort on levels that are too hot (random walk)
+                # or too cold (frozen), where transitions carry little information
+                if not self.min_acceptance_rate <= acceptance_rate <= self.max_acceptance_rate:
+                    level_iterations = max(1, self.iterations_per_temp // 2)
+                else:
+                    level_iterations = self.iterations_per_temp
+                
                 # Cool down
                 temperature *= self.cooling_rate
                 
-                if iteration % 100 == 0:
-                    self.logger.logger.debug(f"Iteration {iteration}: T={temperature:.2f}, "
-                                           f"Cost={current_cost:.3f}, Accept={acceptance_rate:.3f}")
+                if debug_enabled and iteration % 100 == 0:
+                    self.logger.logger.debug("Iteration %d: T=%.2f, Cost=%.3f, Accept=%.3f",
+                                             iteration, temperature, current_cost, acceptance_rate)
             
             # Convert best solution to result
+            best_solution = {"placements": best_placements}
             result = self._solution_to_result(best_solution, stocks, expanded_orders, orders)
             
             # Set metadata
             result.metadata = {
                 "algorithm": "simulated_annealing",
                 "iterations_run": iteration,
+                "stopped_early": stopped_early,
                 "final_temperature": temperature,
                 "best_cost": best_cost,
                 "cooling_schedule": {
@@ -185,7 +249,8 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         expanded = []
         for order in orders:
             for i in range(order.quantity):
-                expanded_order = copy.deepcopy(order)
+                expanded_order = copy.copy(order)
+                expanded_order.shape = copy.copy(order.shape)
                 expanded_order.id = f"{order.id}_{i+1}"
                 expanded_order.quantity = 1
                 expanded.append(expanded_order)
@@ -196,9 +261,14 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         """Generate initial solution using greedy approach"""
         
         solution = {
-            "placements": [],  # List of (order_idx, stock_idx, x, y, rotation)
-            "stock_usage": {i: [] for i in range(len(stocks))},
-            "unplaced_orders": list(range(len(orders)))
+            "placements": [],  # List of (order_idx, stock_idx, x, y, rotation, row_idx)
+            # Per-stock occupied footprints as SoA rows [x, y, width, height, rotation]
+            "stock_usage": {i: np.empty((0, 5)) for i in range(len(stocks))},
+            # Placement index owning each footprint row
+            "row_owners": {i: [] for i in range(len(stocks))},
+            "unplaced_orders": set(range(len(orders))),
+            # Indices of placements holding rectangles, the only rotatable shapes
+            "rect_placements": []
         }
         
         # Sort orders by area (largest first)
@@ -209,189 +279,304 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
             order = orders[order_idx]
             placed = False
             
-            # Try each stock
-            for stock_idx, stock in enumerate(stocks):
-                if order.material_type != stock.material_type:
-                    continue
-                
+            # Try each compatible stock
+            for stock_idx in self._stocks_by_material[order.material_type]:
                 # Find position using bottom-left heuristic
-                position = self._find_position(order, stock, solution["stock_usage"][stock_idx], config)
+                position = self._find_position(order, stocks[stock_idx], 
+                                               solution["stock_usage"][stock_idx], config)
                 
                 if position:
                     x, y, rotation = position
-                    placement = (order_idx, stock_idx, x, y, rotation)
-                    
-                    solution["placements"].append(placement)
                     
                     # Update stock usage
-                    shape = copy.deepcopy(order.shape)
-                    shape.x = x
-                    shape.y = y
-                    shape.rotation = rotation
-                    solution["stock_usage"][stock_idx].append(shape)
+                    footprint = self._footprint(order.shape, x, y, rotation)
+                    row_idx = self._add_row(solution, stock_idx, len(solution["placements"]), footprint)
+                    
+                    if self._is_rect_order[order_idx]:
+                        solution["rect_placements"].append(len(solution["placements"]))
+                    solution["placements"].append((order_idx, stock_idx, x, y, rotation, row_idx))
                     
-                    solution["unplaced_orders"].remove(order_idx)
+                    solution["unplaced_orders"].discard(order_idx)
                     placed = True
                     break
         
         return solution
     
-    def _find_position(self, order: Order, stock: Stock, occupied_shapes: List[Shape], 
+    def _effective_dimensions(self, shape: Shape, rotation: float) -> Tuple[float, float]:
+        """Axis-aligned footprint (width, height) of a shape at a rotation"""
+        shape_type = type(shape)
+        
+        if shape_type is Rectangle:
+            if rotation == 90:
+                return shape.height, shape.width
+            return shape.width, shape.height
+        
+        if shape_type is Circle:
+            diameter = 2 * shape.radius
+            return diameter, diameter
+        
+        # Generic fallback for other shapes and subclasses
+        width = getattr(shape, 'width', 2 * getattr(shape, 'radius', 0))
+        height = getattr(shape, 'height', 2 * getattr(shape, 'radius', 0))
+        if isinstance(shape, Rectangle) and rotation == 90:
+            return height, width
+        return width, height
+    
+    def _footprint(self, shape: Shape, x: float, y: float, rotation: float) -> List[float]:
+        """Occupancy row [x, y, width, height, rotation] for a placed shape"""
+        width, height = self._effective_dimensions(shape, rotation)
+        return [x, y, width, height, rotation]
+    
+    def _add_row(self, solution: Dict[str, Any], stock_idx: int, placement_idx: int,
+                 footprint) -> int:
+        """Append a footprint row to a stock's occupancy array and return its index"""
+        solution["stock_usage"][stock_idx] = np.concatenate(
+            (solution["stock_usage"][stock_idx], [footprint]))
+        solution["row_owners"][stock_idx].append(placement_idx)
+        return len(solution["row_owners"][stock_idx]) - 1
+    
+    def _remove_row(self, solution: Dict[str, Any], stock_idx: int, row_idx: int) -> np.ndarray:
+        """Remove a footprint row in O(1) by moving the last row into its slot"""
+        usage = solution["stock_usage"][stock_idx]
+        owners = solution["row_owners"][stock_idx]
+        removed = usage[row_idx].copy()
+        last = len(owners) - 1
+        
+        if row_idx != last:
+            usage[row_idx] = usage[last]
+            moved_idx = owners[last]
+            owners[row_idx] = moved_idx
+            solution["placements"][moved_idx] = solution["placements"][moved_idx][:5] + (row_idx,)
+        
+        solution["stock_usage"][stock_idx] = usage[:last]
+        owners.pop()
+        return removed
+    
+    def _own_stock(self, solution: Dict[str, Any], stock_idx: int):
+        """Give a neighbor private copies of one stock's footprint rows and
+        row owners before a move edits them in place"""
+        solution["stock_usage"][stock_idx] = solution["stock_usage"][stock_idx].copy()
+        solution["row_owners"][stock_idx] = list(solution["row_owners"][stock_idx])
+    
+    def _footprints_overlap(self, footprint1, footprint2) -> bool:
+        """Check two footprint rows for interior overlap (touching edges are allowed)"""
+        return (footprint1[0] < footprint2[0] + footprint2[2] and 
+                footprint2[0] < footprint1[0] + footprint1[2] and
+                footprint1[1] < footprint2[1] + footprint2[3] and 
+                footprint2[1] < footprint1[1] + footprint1[3])
+    
+    def _footprint_fits(self, solution: Dict[str, Any], stock_idx: int, stock: Stock,
+                        footprint, ignored_rows: List[int]) -> bool:
+        """Check a footprint lies inside the stock and clears its occupied rows"""
+        x, y, width, height = footprint[:4]
+        if x + width > stock.width or y + height > stock.height:
+            return False
+        
+        usage = solution["stock_usage"][stock_idx]
+        clash = ((usage[:, 0] < x + width) & (x < usage[:, 0] + usage[:, 2]) & 
+                 (usage[:, 1] < y + height) & (y < usage[:, 1] + usage[:, 3]))
+        clash[ignored_rows] = False
+        return not clash.any()
+    
+    def _find_position(self, order: Order, stock: Stock, occupied: np.ndarray, 
                       config: OptimizationConfig) -> Optional[Tuple[float, float, float]]:
-        """Find position for order in stock"""
+        """Find position for order in stock given its occupancy array"""
         
         # Try different rotations
         rotations = [0]
         if config.allow_rotation and isinstance(order.shape, Rectangle):
             rotations = [0, 90]
         
+        occ_x, occ_y = occupied[:, 0], occupied[:, 1]
+        occ_right = occ_x + occupied[:, 2]
+        occ_top = occ_y + occupied[:, 3]
+        
         for rotation in rotations:
-            shape = copy.deepcopy(order.shape)
-            shape.rotation = rotation
-            
-            # Effective dimensions after rotation
-            if isinstance(shape, Rectangle) and rotation == 90:
-                width, height = shape.height, shape.width
-            else:
-                width = getattr(shape, 'width', 2 * getattr(shape, 'radius', 0))
-                height = getattr(shape, 'height', 2 * getattr(shape, 'radius', 0))
+            width, height = self._effective_dimensions(order.shape, rotation)
             
             # Check if it fits at all
             if width > stock.width or height > stock.height:
                 continue
             
-            # Try positions
-            for y in range(0, int(stock.height - height) + 1, 10):
-                for x in range(0, int(stock.width - width) + 1, 10):
-                    shape.x = x
-                    shape.y = y
-                    
-                    # Check overlaps
-                    valid = True
-                    for occupied in occupied_shapes:
-                        if shape.overlaps(occupied):
-                            valid = False
-                            break
-                    
-                    if valid:
-                        return (x, y, rotation)
+            # Candidate corner points: the stock origin plus the right and
+            # top edges of every occupied footprint
+            xs = np.unique(np.concatenate(([0.0], occ_right)))
+            xs = xs[xs <= stock.width - width]
+            ys = np.unique(np.concatenate(([0.0], occ_top)))
+            ys = ys[ys <= stock.height - height]
+            
+            # Scan rows bottom-up, testing a whole row of x candidates at once
+            for y in ys.tolist():
+                in_row = (occ_y < y + height) & (y < occ_top)
+                if not in_row.any():
+                    return (xs[0].item(), y, rotation)
+                
+                blocked = ((occ_x[in_row, None] < xs + width) & 
+                           (xs < occ_right[in_row, None])).any(axis=0)
+                free = np.flatnonzero(~blocked)
+                if free.size:
+                    return (xs[free[0]].item(), y, rotation)
         
         return None
     
     def _generate_neighbor(self, solution: Dict[str, Any], stocks: List[Stock], 
-                          orders: List[Order], config: OptimizationConfig) -> Dict[str, Any]:
-        """Generate neighbor solution"""
-        
-        neighbor = copy.deepcopy(solution)
+                          orders: List[Order], config: OptimizationConfig,
+                          move_draw: int, pick: List[float]) -> Dict[str, Any]:
+        """Generate neighbor solution from pre-drawn move and pick numbers
+        
+        The neighbor shares the per-stock occupancy arrays and row owner lists
+        with the solution it came from; a move copies the ones it edits first
+        (see _own_stock), so only the placement list is copied per iteration.
+        """
+        
+        neighbor = {
+            "placements": list(solution["placements"]),
+            "stock_usage": dict(solution["stock_usage"]),
+            "row_owners": dict(solution["row_owners"]),
+            # No move places or drops an order, so this set is never edited
+            "unplaced_orders": solution["unplaced_orders"],
+            # Only reorder rewrites this, and it builds its own list
+            "rect_placements": solution["rect_placements"]
+        }
         
         if not neighbor["placements"]:
             return neighbor
         
-        # Choose random move type
-        move_type = random.choice(["relocate", "swap", "rotate", "reorder"])
+        move_type = self.MOVE_TYPES[move_draw]
         
         if move_type == "relocate" and neighbor["placements"]:
-            self._relocate_order(neighbor, stocks, orders, config)
+            self._relocate_order(neighbor, stocks, orders, config, pick)
         elif move_type == "swap" and len(neighbor["placements"]) >= 2:
-            self._swap_orders(neighbor, stocks, orders, config)
+            self._swap_orders(neighbor, stocks, orders, config, pick)
         elif move_type == "rotate" and config.allow_rotation:
-            self._rotate_order(neighbor, stocks, orders, config)
+            self._rotate_order(neighbor, stocks, orders, config, pick)
         elif move_type == "reorder":
             self._reorder_placement(neighbor, stocks, orders, config)
         
         return neighbor
     
     def _relocate_order(self, solution: Dict[str, Any], stocks: List[Stock], 
-                       orders: List[Order], config: OptimizationConfig):
+                       orders: List[Order], config: OptimizationConfig, pick: List[float]):
         """Relocate a random order"""
         
         if not solution["placements"]:
             return
         
         # Choose random placement
-        placement_idx = random.randint(0, len(solution["placements"]) - 1)
-        order_idx, old_stock_idx, old_x, old_y, old_rotation = solution["placements"][placement_idx]
+        placement_idx = int(pick[0] * len(solution["placements"]))
+        order_idx, old_stock_idx, old_x, old_y, old_rotation, old_row = solution["placements"][placement_idx]
         
         # Remove from current position
         order = orders[order_idx]
-        old_shape = copy.deepcopy(order.shape)
-        old_shape.x = old_x
-        old_shape.y = old_y
-        old_shape.rotation = old_rotation
-        
-        if old_shape in solution["stock_usage"][old_stock_idx]:
-            solution["stock_usage"][old_stock_idx].remove(old_shape)
+        self._own_stock(solution, old_stock_idx)
+        old_footprint = self._remove_row(solution, old_stock_idx, old_row)
         
         # Try new position
-        for stock_idx, stock in enumerate(stocks):
-            if order.material_type != stock.material_type:
-                continue
-            
-            position = self._find_position(order, stock, solution["stock_usage"][stock_idx], config)
+        for stock_idx in self._stocks_by_material[order.material_type]:
+            position = self._find_position(order, stocks[stock_idx], 
+                                           solution["stock_usage"][stock_idx], config)
             
             if position:
                 new_x, new_y, new_rotation = position
                 
-                # Update placement
-                solution["placements"][placement_idx] = (order_idx, stock_idx, new_x, new_y, new_rotation)
-                
-                # Update stock usage
-                new_shape = copy.deepcopy(order.shape)
-                new_shape.x = new_x
-                new_shape.y = new_y
-                new_shape.rotation = new_rotation
-                solution["stock_usage"][stock_idx].append(new_shape)
+                # Update stock usage and placement
+                if stock_idx != old_stock_idx:
+                    self._own_stock(solution, stock_idx)
+                footprint = self._footprint(order.shape, new_x, new_y, new_rotation)
+                row_idx = self._add_row(solution, stock_idx, placement_idx, footprint)
+                solution["placements"][placement_idx] = (order_idx, stock_idx, new_x, new_y, 
+                                                         new_rotation, row_idx)
                 return
         
         # If no new position found, restore old position
-        solution["stock_usage"][old_stock_idx].append(old_shape)
+        row_idx = self._add_row(solution, old_stock_idx, placement_idx, old_footprint)
+        solution["placements"][placement_idx] = (order_idx, old_stock_idx, old_x, old_y, 
+                                                 old_rotation, row_idx)
     
     def _swap_orders(self, solution: Dict[str, Any], stocks: List[Stock], 
-                    orders: List[Order], config: OptimizationConfig):
+                    orders: List[Order], config: OptimizationConfig, pick: List[float]):
         """Swap positions of two orders"""
         
-        if len(solution["placements"]) < 2:
+        num_placements = len(solution["placements"])
+        if num_placements < 2:
             return
         
-        # Choose two random placements
-        idx1, idx2 = random.sample(range(len(solution["placements"])), 2)
+        # Choose two distinct random placements
+        idx1 = int(pick[0] * num_placements)
+        idx2 = int(pick[1] * (num_placements - 1))
+        if idx2 >= idx1:
+            idx2 += 1
         
         placement1 = solution["placements"][idx1]
         placement2 = solution["placements"][idx2]
         
         # Swap positions
-        order1_idx, stock1_idx, x1, y1, rot1 = placement1
-        order2_idx, stock2_idx, x2, y2, rot2 = placement2
+        order1_idx, stock1_idx, x1, y1, rot1, row1 = placement1
+        order2_idx, stock2_idx, x2, y2, rot2, row2 = placement2
+        order1, order2 = orders[order1_idx], orders[order2_idx]
+        stock1, stock2 = stocks[stock1_idx], stocks[stock2_idx]
+        
+        if (order1.material_type != stock2.material_type or 
+                order2.material_type != stock1.material_type):
+            return
         
-        # Update placements
-        solution["placements"][idx1] = (order1_idx, stock2_idx, x2, y2, rot2)
-        solution["placements"][idx2] = (order2_idx, stock1_idx, x1, y1, rot1)
+        # Footprints of each order at the other's position
+        footprint1 = self._footprint(order1.shape, x2, y2, rot2)
+        footprint2 = self._footprint(order2.shape, x1, y1, rot1)
+        
+        # Rows vacated by the swap must not block the incoming footprints
+        if stock1_idx == stock2_idx:
+            if self._footprints_overlap(footprint1, footprint2):
+                return
+            vacated1 = vacated2 = [row1, row2]
+        else:
+            vacated1, vacated2 = [row1], [row2]
         
-        # Update stock usage (simplified - assumes swap is valid)
-        # In practice, should check feasibility
+        # Reject infeasible swaps, leaving the solution untouched
+        if not (self._footprint_fits(solution, stock2_idx, stock2, footprint1, vacated2) and 
+                self._footprint_fits(solution, stock1_idx, stock1, footprint2, vacated1)):
+            return
+        
+        # Update placements and stock usage; the footprint rows follow their positions
+        self._own_stock(solution, stock1_idx)
+        if stock2_idx != stock1_idx:
+            self._own_stock(solution, stock2_idx)
+        solution["placements"][idx1] = (order1_idx, stock2_idx, x2, y2, rot2, row2)
+        solution["placements"][idx2] = (order2_idx, stock1_idx, x1, y1, rot1, row1)
+        solution["row_owners"][stock2_idx][row2] = idx1
+        solution["row_owners"][stock1_idx][row1] = idx2
+        solution["stock_usage"][stock2_idx][row2] = footprint1
+        solution["stock_usage"][stock1_idx][row1] = footprint2
     
     def _rotate_order(self, solution: Dict[str, Any], stocks: List[Stock], 
-                     orders: List[Order], config: OptimizationConfig):
+                     orders: List[Order], config: OptimizationConfig, pick: List[float]):
         """Rotate a random order"""
         
         if not solution["placements"]:
             return
         
         # Choose random placement with rectangle
-        rect_placements = [(i, p) for i, p in enumerate(solution["placements"]) 
-                          if isinstance(orders[p[0]].shape, Rectangle)]
+        rect_placements = solution["rect_placements"]
         
         if not rect_placements:
             return
         
-        placement_idx, placement = random.choice(rect_placements)
-        order_idx, stock_idx, x, y, rotation = placement
+        placement_idx = rect_placements[int(pick[0] * len(rect_placements))]
+        order_idx, stock_idx, x, y, rotation, row_idx = solution["placements"][placement_idx]
         
         # Toggle rotation
         new_rotation = 90 if rotation == 0 else 0
         
-        # Update placement
-        solution["placements"][placement_idx] = (order_idx, stock_idx, x, y, new_rotation)
+        # The turned footprint must still lie inside the stock and clear the
+        # other rows; otherwise the solution is left untouched
+        footprint = self._footprint(orders[order_idx].shape, x, y, new_rotation)
+        if not self._footprint_fits(solution, stock_idx, stocks[stock_idx], footprint, [row_idx]):
+            return
+        
+        # Update placement and its footprint row
+        self._own_stock(solution, stock_idx)
+        solution["placements"][placement_idx] = (order_idx, stock_idx, x, y, new_rotation, row_idx)
+        solution["stock_usage"][stock_idx][row_idx] = footprint
     
     def _reorder_placement(self, solution: Dict[str, Any], stocks: List[Stock], 
                           orders: List[Order], config: OptimizationConfig):
@@ -400,8 +585,17 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         if len(solution["placements"]) < 2:
             return
         
-        # Shuffle placements
-        random.shuffle(solution["placements"])
+        # Shuffle placements and repoint the footprint rows and rectangle index;
+        # every stock's owner list changes, so each gets its own copy
+        self._rng.shuffle(solution["placements"])
+        row_owners = solution["row_owners"]
+        for stock_idx, owners in row_owners.items():
+            row_owners[stock_idx] = list(owners)
+        rect_placements = solution["rect_placements"] = []
+        for placement_idx, placement in enumerate(solution["placements"]):
+            solution["row_owners"][placement[1]][placement[5]] = placement_idx
+            if self._is_rect_order[placement[0]]:
+                rect_placements.append(placement_idx)
     
     def _evaluate_solution(self, solution: Dict[str, Any], stocks: List[Stock], 
                           orders: List[Order], config: OptimizationConfig) -> float:
@@ -413,7 +607,7 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         used_stocks = set()
         
         for placement in solution["placements"]:
-            order_idx, stock_idx, x, y, rotation = placement
+            order_idx, stock_idx, x, y, rotation, _ = placement
             total_used_area += orders[order_idx].shape.area()
             used_stocks.add(stock_idx)
         
@@ -432,17 +626,17 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         return cost
     
     def _accept_solution(self, current_cost: float, neighbor_cost: float, 
-                        temperature: float) -> bool:
-        """Accept or reject neighbor solution"""
+                        temperature: float, exp_sample: float) -> bool:
+        """Accept or reject neighbor solution given a pre-drawn Exp(1) sample"""
         
         if neighbor_cost < current_cost:
             return True
         
-        # Acceptance probability
+        # Metropolis criterion: U < exp(-delta/T) is equivalent to
+        # delta < T * -log(U), and -log(U) is an Exp(1) variate
         delta = neighbor_cost - current_cost
-        probability = math.exp(-delta / temperature)
         
-        return random.random() < probability
+        return delta < temperature * exp_sample
     
     def _solution_to_result(self, solution: Dict[str, Any], stocks: List[Stock], 
                            expanded_orders: List[Order], original_orders: List[Order]) -> CuttingResult:
@@ -453,24 +647,20 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         
         placed_shapes = []
         used_stocks = set()
+        now = datetime.now()
         
         for placement in solution["placements"]:
-            order_idx, stock_idx, x, y, rotation = placement
+            order_idx, stock_idx, x, y, rotation, _ = placement
             order = expanded_orders[order_idx]
             stock = stocks[stock_idx]
             
             # Create placed shape
-            shape = copy.deepcopy(order.shape)
+            shape = copy.copy(order.shape)
             shape.x = x
             shape.y = y
             shape.rotation = rotation
             
-            placed_shape = PlacedShape(
-                order_id=order.id,
-                shape=shape,
-                stock_id=stock.id,
-                rotation_applied=rotation
-            )
+            placed_shape = PlacedShape.build(order.id, shape, stock.id, now, rotation)
             
             placed_shapes.append(placed_shape)
             used_stocks.add(stock_idx)
@@ -488,7 +678,7 @@ class SimulatedAnnealingAlgorithm(BaseAlgorithm):
         
         # Calculate efficiency
         if placed_shapes:
-            total_placed_area = sum(ps.shape.area() for ps in placed_shapes)
+            total_placed_area = result.total_area_used
             total_stock_area = sum(stocks[i].area for i in used_stocks)
             result.efficiency_percentage = (total_placed_area / total_stock_area * 100) if total_stock_area > 0 else 0
         else:
@@ -3,10 +3,70 @@ Bottom-Left Fill Algorithm for Surface Cutting Optimizer
 """
 
 import copy
-from typing import List, Tuple, Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+
 from ...core.models import Stock, Order, CuttingResult, PlacedShape, OptimizationConfig
 from ...core.geometry import Rectangle, Circle
 from ..base import BaseAlgorithm
+from .._geom_fast import NUMBA_AVAILABLE, njit, aabb_any_overlap
+
+
+@njit(cache=True)
+def _bl_scan(stock_w, stock_h, shape_w, shape_h, cand_x, cand_y, occ_x, occ_y, occ_w, occ_h, max_y):
+    """Lowest-then-leftmost free corner at or below max_y for one orientation, or (-1, -1)"""
+    n = occ_x.shape[0]
+    band_x = np.empty(n)
+    band_y = np.empty(n)
+    band_w = np.empty(n)
+    band_h = np.empty(n)
+    
+    # Candidate corners arrive sorted and unique; binary-search the cutoffs
+    rows = np.searchsorted(cand_y, min(stock_h - shape_h, max_y), side='right')
+    cols = np.searchsorted(cand_x, stock_w - shape_w, side='right')
+    
+    for i in range(rows):
+        y = cand_y[i]
+        
+        # Only footprints crossing this row's band can block it
+        m = 0
+        for k in range(n):
+            if y < occ_y[k] + occ_h[k] and y + shape_h > occ_y[k]:
+                band_x[m] = occ_x[k]
+                band_y[m] = occ_y[k]
+                band_w[m] = occ_w[k]
+                band_h[m] = occ_h[k]
+                m += 1
+        
+        for j in range(cols):
+            x = cand_x[j]
+            if not aabb_any_overlap(x, y, shape_w, shape_h, band_x, band_y, band_w, band_h, m):
+                return x, y
+    
+    return -1.0, -1.0
+
+
+@njit(cache=True)
+def find_bl_position(stock_w, stock_h, shape_w, shape_h, cand_x, cand_y, 
+                     occ_x, occ_y, occ_w, occ_h, allow_rotation):
+    """Bottom-left position (x, y, rotated) over both orientations; x < 0 means no fit"""
+    best_x, best_y = -1.0, -1.0
+    if shape_w <= stock_w and shape_h <= stock_h:
+        best_x, best_y = _bl_scan(stock_w, stock_h, shape_w, shape_h, cand_x, cand_y, 
+                                  occ_x, occ_y, occ_w, occ_h, np.inf)
+    
+    if allow_rotation and shape_h <= stock_w and shape_w <= stock_h:
+        # The turned shape only wins at or below the unrotated position
+        max_y = best_y if best_x >= 0 else np.inf
+        x, y = _bl_scan(stock_w, stock_h, shape_h, shape_w, cand_x, cand_y, 
+                        occ_x, occ_y, occ_w, occ_h, max_y)
+        if x >= 0 and (best_x < 0 or y < best_y or (y == best_y and x < best_x)):
+            return x, y, True
+    
+    return best_x, best_y, False
 
 
 class BottomLeftAlgorithm(BaseAlgorithm):
@@ -15,6 +75,10 @@ class BottomLeftAlgorithm(BaseAlgorithm):
     def __init__(self):
         super().__init__()
         self.name = "Bottom-Left Fill"
+        
+        # Last search result per (stock id, width, height, rotation allowed),
+        # tagged with the stock's footprint count when it was computed
+        self._pos_cache: Dict[Tuple, Tuple[int, Optional[Tuple[float, float, bool]]]] = {}
     
     def optimize(self, stocks: List[Stock], orders: List[Order], 
                 config: OptimizationConfig) -> CuttingResult:
@@ -27,20 +91,22 @@ class BottomLeftAlgorithm(BaseAlgorithm):
         processed_orders = self.preprocess_orders(orders, config)
         processed_stocks = self.preprocess_stocks(stocks, config)
         
-        # Group orders by material type
-        orders_by_material = {}
+        # Group orders and stocks by material type in one pass each
+        orders_by_material = defaultdict(list)
         for order in processed_orders:
-            material = order.material_type
-            if material not in orders_by_material:
-                orders_by_material[material] = []
-            orders_by_material[material].append(order)
+            orders_by_material[order.material_type].append(order)
+        
+        stocks_by_material = defaultdict(list)
+        for stock in processed_stocks:
+            stocks_by_material[stock.material_type].append(stock)
         
         # Process each material type separately
         used_stocks = set()
+        placed_counts = defaultdict(int)
         
         for material_type, material_orders in orders_by_material.items():
             # Get stocks for this material
-            material_stocks = [s for s in processed_stocks if s.material_type == material_type]
+            material_stocks = stocks_by_material.get(material_type, [])
             
             if not material_stocks:
                 # No stocks for this material, add to unfulfilled
@@ -48,10 +114,11 @@ class BottomLeftAlgorithm(BaseAlgorithm):
                 continue
             
             # Optimize for this material
-            material_result = self._optimize_material(material_stocks, material_orders, config)
+            material_result = self._optimize_material(material_stocks, material_orders, config, 
+                                                      placed_counts)
             
             # Merge results
-            result.placed_shapes.extend(material_result.placed_shapes)
+            result.add_placed_shapes(material_result.placed_shapes)
             result.unfulfilled_orders.extend(material_result.unfulfilled_orders)
             used_stocks.update([ps.stock_id for ps in material_result.placed_shapes])
         
@@ -59,17 +126,14 @@ class BottomLeftAlgorithm(BaseAlgorithm):
         result.total_stock_used = len(used_stocks)
         
         # Count fulfilled orders (by original order ID, not expanded)
-        fulfilled_order_ids = set()
-        for placed_shape in result.placed_shapes:
-            # Extract original order ID (remove the _1, _2 suffix)
-            original_id = placed_shape.order_id.rsplit('_', 1)[0]
-            fulfilled_order_ids.add(original_id)
-        
-        result.total_orders_fulfilled = len(fulfilled_order_ids)
+        result.total_orders_fulfilled = len(placed_counts)
         
         if result.placed_shapes:
-            total_placed_area = sum(ps.shape.area() for ps in result.placed_shapes)
-            total_stock_area = sum(stock.area for stock in stocks if stock.id in used_stocks)
+            # Every unit of an order has the same area, so weight by placed counts
+            total_placed_area = sum(order.shape.area() * placed_counts.get(order.id, 0) 
+                                    for order in processed_orders)
+            stock_areas = {stock.id: stock.area for stock in stocks}
+            total_stock_area = sum(stock_areas[stock_id] for stock_id in used_stocks)
             result.efficiency_percentage = (total_placed_area / total_stock_area) * 100 if total_stock_area > 0 else 0
         else:
             result.efficiency_percentage = 0
@@ -77,167 +141,189 @@ class BottomLeftAlgorithm(BaseAlgorithm):
         return result
     
     def _optimize_material(self, stocks: List[Stock], orders: List[Order], 
-                          config: OptimizationConfig) -> CuttingResult:
-        """Optimize orders for a specific material type"""
+                          config: OptimizationConfig, placed_counts: Dict[str, int]) -> CuttingResult:
+        """Optimize orders for a specific material type, counting placed units per order id"""
         
         result = CuttingResult()
         remaining_orders = []
+        self._pos_cache = {}
+        
+        # Track occupied footprints for each stock
+        stock_occupied = {stock.id: self._new_occupied() for stock in stocks}
+        add_placed = result.add_placed
+        build_placed = PlacedShape.build
+        now = datetime.now()  # One placement timestamp for the whole pass
         
-        # Expand orders by quantity
-        expanded_orders = []
+        # Footprints never overlap, so a stock whose uncovered area is below a
+        # piece's footprint area cannot take it and is skipped without a search
+        free_area = {stock.id: stock.area for stock in stocks}
+        
+        # Try to place each unit of every order; per-unit ids and copies are
+        # only materialized once a unit is placed or left over
         for order in orders:
-            for i in range(order.quantity):
-                expanded_order = copy.deepcopy(order)
-                expanded_order.id = f"{order.id}_{i+1}"
-                expanded_order.quantity = 1
-                expanded_orders.append(expanded_order)
-        
-        # Track occupied areas for each stock
-        stock_occupied = {stock.id: [] for stock in stocks}
-        
-        # Try to place each order
-        for order in expanded_orders:
-            placed = False
+            footprint_width, footprint_height = self._shape_size(order.shape)
+            footprint_area = footprint_width * footprint_height
             
-            # Try each stock
-            for stock in stocks:
-                # Check material compatibility
-                if stock.material_type != order.material_type:
-                    continue
-                
-                # Try to place shape
-                position = self._find_bottom_left_position(
-                    stock, order.shape, stock_occupied[stock.id], config
-                )
+            for copy_index in range(order.quantity):
+                placed = False
                 
-                if position:
-                    # Place the shape
-                    placed_shape = copy.deepcopy(order.shape)
-                    placed_shape.x = position[0]
-                    placed_shape.y = position[1]
+                # Try each stock (already filtered to this material, largest first)
+                for stock in stocks:
+                    if free_area[stock.id] < footprint_area:
+                        continue
                     
-                    placed = PlacedShape(
-                        order_id=order.id,
-                        shape=placed_shape,
-                        stock_id=stock.id
+                    # Try to place shape
+                    position = self._find_bottom_left_position(
+                        stock, order.shape, stock_occupied[stock.id], config
                     )
                     
-                    result.placed_shapes.append(placed)
-                    stock_occupied[stock.id].append(placed_shape)
-                    placed = True
-                    break
-            
-            if not placed:
-                remaining_orders.append(order)
+                    if position:
+                        # Place the shape
+                        placed_shape = copy.copy(order.shape)
+                        placed_shape.x = position[0]
+                        placed_shape.y = position[1]
+                        if position[2]:
+                            placed_shape.width, placed_shape.height = placed_shape.height, placed_shape.width
+                        
+                        add_placed(build_placed(f"{order.id}_{copy_index + 1}", placed_shape, 
+                                                stock.id, now))
+                        self._add_occupied(stock_occupied[stock.id], position[0], position[1], 
+                                           *self._shape_size(placed_shape))
+                        placed_counts[order.id] += 1
+                        free_area[stock.id] -= footprint_area
+                        placed = True
+                        break
+                
+                if not placed:
+                    remaining_order = copy.copy(order)
+                    remaining_order.shape = copy.copy(order.shape)
+                    remaining_order.id = f"{order.id}_{copy_index + 1}"
+                    remaining_order.quantity = 1
+                    remaining_orders.append(remaining_order)
         
         result.unfulfilled_orders = remaining_orders
         return result
     
     def _find_bottom_left_position(self, stock: Stock, shape, 
-                                  occupied_shapes: List, config: OptimizationConfig) -> Optional[Tuple[float, float]]:
-        """Find bottom-left position for a shape in stock"""
+                                  occupied: Dict[str, Any], config: OptimizationConfig) -> Optional[Tuple[float, float, bool]]:
+        """Find bottom-left position (x, y, rotated) for a shape in stock"""
         
         if not isinstance(shape, (Rectangle, Circle)):
             return None
         
+        width, height = self._shape_size(shape)
+        # A turned square is the same footprint, so only try it once
+        allow_rotation = config.allow_rotation and isinstance(shape, Rectangle) and width != height
+        
+        # Identical pieces re-ask the same question until the stock changes
+        key = (stock.id, width, height, allow_rotation)
+        cached = self._pos_cache.get(key)
+        if cached and cached[0] == occupied['count']:
+            return cached[1]
+        
+        position = self._search_position(stock, width, height, allow_rotation, occupied)
+        self._pos_cache[key] = (occupied['count'], position)
+        return position
+    
+    def _search_position(self, stock: Stock, width: float, height: float, allow_rotation: bool, 
+                         occupied: Dict[str, Any]) -> Optional[Tuple[float, float, bool]]:
+        """Bottom-left search over the stock's candidate corners"""
+        
+        # Compiled scalar kernel when numba is installed
+        if NUMBA_AVAILABLE:
+            occ_x, occ_y, occ_w, occ_h = occupied['boxes'][:, :occupied['count']]
+            x, y, rotated = find_bl_position(float(stock.width), float(stock.height), 
+                                             float(width), float(height), 
+                                             occupied['xs'], occupied['ys'], 
+                                             occ_x, occ_y, occ_w, occ_h, allow_rotation)
+            return (x, y, rotated) if x >= 0 else None
+        
         # Try different orientations if rotation is allowed
-        orientations = [shape]
+        orientations = [(width, height, False)]
         
-        if config.allow_rotation and isinstance(shape, Rectangle):
-            rotated = copy.deepcopy(shape)
-            rotated.width, rotated.height = rotated.height, rotated.width
-            orientations.append(rotated)
+        if allow_rotation:
+            orientations.append((height, width, True))
         
         best_position = None
-        best_y = float('inf')
         
-        for oriented_shape in orientations:
+        for width, height, rotated in orientations:
             # Check if shape fits in stock at all
-            if isinstance(oriented_shape, Rectangle):
-                if (oriented_shape.width > stock.width or 
-                    oriented_shape.height > stock.height):
-                    continue
-            elif isinstance(oriented_shape, Circle):
-                if (oriented_shape.radius * 2 > stock.width or 
-                    oriented_shape.radius * 2 > stock.height):
-                    continue
+            if width > stock.width or height > stock.height:
+                continue
             
-            # Try positions from bottom-left
-            for y in self._get_y_positions(stock, occupied_shapes, oriented_shape):
-                for x in self._get_x_positions(stock, occupied_shapes, oriented_shape, y):
-                    
-                    # Check if position is valid
-                    if self._is_valid_position(stock, oriented_shape, x, y, occupied_shapes, config):
-                        if y < best_y or (y == best_y and x < best_position[0] if best_position else True):
-                            best_position = (x, y)
-                            best_y = y
+            # Candidates are sorted bottom-up then left-right, so the first
+            # valid one is this orientation's bottom-left position; rows above
+            # the best position so far cannot beat it
+            position = None
+            for y in self._get_y_positions(stock, occupied, height):
+                if best_position and y > best_position[1]:
+                    break
+                xs = self._get_x_positions(stock, occupied, width, y)
+                valid = self._is_valid_position(stock, width, height, xs, y, occupied)
+                if valid.any():
+                    position = (xs[valid.argmax()].item(), y.item(), rotated)
+                    break
+            
+            if position and (best_position is None or 
+                             (position[1], position[0]) < (best_position[1], best_position[0])):
+                best_position = position
         
         return best_position
     
-    def _get_y_positions(self, stock: Stock, occupied_shapes: List, shape) -> List[float]:
-        """Get candidate Y positions (bottom-up)"""
-        positions = [0]  # Start from bottom
-        
-        for occupied in occupied_shapes:
-            # Add position above each occupied shape
-            if isinstance(occupied, Rectangle):
-                positions.append(occupied.y + occupied.height)
-            elif isinstance(occupied, Circle):
-                positions.append(occupied.y + occupied.radius)
-        
-        # Filter valid positions
-        if isinstance(shape, Rectangle):
-            max_y = stock.height - shape.height
-        elif isinstance(shape, Circle):
-            max_y = stock.height - shape.radius * 2
-        else:
-            max_y = stock.height
+    def _shape_size(self, shape) -> Tuple[float, float]:
+        """Axis-aligned footprint (width, height) of a shape"""
+        if isinstance(shape, Circle):
+            return shape.radius * 2, shape.radius * 2
+        return shape.width, shape.height
+    
+    def _new_occupied(self, capacity: int = 16) -> Dict[str, Any]:
+        """Empty occupancy: SoA rows x, y, width, height, a fill count and the
+        sorted candidate corner coordinates"""
+        return {'boxes': np.empty((4, capacity)), 'count': 0, 
+                'xs': np.zeros(1), 'ys': np.zeros(1)}
+    
+    def _add_occupied(self, occupied: Dict[str, Any], x: float, y: float, 
+                      width: float, height: float):
+        """Append a footprint, doubling the buffer when it is full"""
+        count = occupied['count']
+        if count == occupied['boxes'].shape[1]:
+            grown = np.empty((4, count * 2))
+            grown[:, :count] = occupied['boxes']
+            occupied['boxes'] = grown
+        occupied['boxes'][:, count] = (x, y, width, height)
+        occupied['count'] = count + 1
         
-        return [y for y in sorted(set(positions)) if y <= max_y]
+        # Keep the candidate corners sorted and unique as edges arrive
+        for key, edge in (('xs', x + width), ('ys', y + height)):
+            edges = occupied[key]
+            idx = np.searchsorted(edges, edge)
+            if idx == len(edges) or edges[idx] != edge:
+                occupied[key] = np.insert(edges, idx, edge)
+    
+    def _get_y_positions(self, stock: Stock, occupied: Dict[str, Any], height: float) -> np.ndarray:
+        """Get candidate Y positions (bottom-up)"""
+        ys = occupied['ys']
+        return ys[:np.searchsorted(ys, stock.height - height, side='right')]
     
-    def _get_x_positions(self, stock: Stock, occupied_shapes: List, shape, y: float) -> List[float]:
+    def _get_x_positions(self, stock: Stock, occupied: Dict[str, Any], width: float, y: float) -> np.ndarray:
         """Get candidate X positions for given Y"""
-        positions = [0]  # Start from left
-        
-        for occupied in occupied_shapes:
-            # Add position to the right of each occupied shape
-            if isinstance(occupied, Rectangle):
-                positions.append(occupied.x + occupied.width)
-            elif isinstance(occupied, Circle):
-                positions.append(occupied.x + occupied.radius)
-        
-        # Filter valid positions
-        if isinstance(shape, Rectangle):
-            max_x = stock.width - shape.width
-        elif isinstance(shape, Circle):
-            max_x = stock.width - shape.radius * 2
-        else:
-            max_x = stock.width
-        
-        return [x for x in sorted(set(positions)) if x <= max_x]
+        xs = occupied['xs']
+        return xs[:np.searchsorted(xs, stock.width - width, side='right')]
     
-    def _is_valid_position(self, stock: Stock, shape, x: float, y: float, 
-                          occupied_shapes: List, config: OptimizationConfig) -> bool:
-        """Check if position is valid (no overlaps, within bounds)"""
-        
-        # Create temporary shape at position
-        temp_shape = copy.deepcopy(shape)
-        temp_shape.x = x
-        temp_shape.y = y
+    def _is_valid_position(self, stock: Stock, width: float, height: float, xs: np.ndarray, y: float, 
+                          occupied: Dict[str, Any]) -> np.ndarray:
+        """Check which x positions on row y are valid (no overlaps, within bounds)"""
         
         # Check bounds
-        if isinstance(temp_shape, Rectangle):
-            if (x + temp_shape.width > stock.width or 
-                y + temp_shape.height > stock.height):
-                return False
-        elif isinstance(temp_shape, Circle):
-            if (x + temp_shape.radius * 2 > stock.width or 
-                y + temp_shape.radius * 2 > stock.height):
-                return False
-        
-        # Check overlaps with occupied shapes
-        for occupied in occupied_shapes:
-            if temp_shape.overlaps(occupied):
-                return False
-        
-        return True 
\ No newline at end of file
+        if y + height > stock.height:
+            return np.zeros(len(xs), dtype=bool)
+        in_bounds = xs + width <= stock.width
+        
+        # Only footprints crossing the row's band can block it (touching edges are allowed)
+        occ_x, occ_y, occ_w, occ_h = occupied['boxes'][:, :occupied['count']]
+        band = (y < occ_y + occ_h) & (y + height > occ_y)
+        left, right = occ_x[band], occ_x[band] + occ_w[band]
+        
+        # Check overlaps of every candidate with every blocking footprint at once
+        overlap = (xs[:, None] < right) & (xs[:, None] + width > left)
+        return in_bounds & ~overlap.any(axis=1)
@@ -28,19 +28,43 @@ Examples:
     >>> print(f"Efficiency: {result.efficiency_percentage:.1f}%")
 """
 
-import random
+import copy
 import time
-from typing import List, Dict, Any
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict
 
-from ...core.models import OptimizationResult, OptimizationConfig
-from ...core.geometry import Rectangle, can_place_rectangle
-from ...utils.metrics import calculate_efficiency
+import numpy as np
+
+from ...core.models import Stock, Order, CuttingResult, PlacedShape, OptimizationConfig
+from ...core.geometry import Rectangle, Circle
 from ...utils.logging import get_logger
 from ..base import BaseAlgorithm
+from .._geom_fast import NUMBA_AVAILABLE, njit
 
 logger = get_logger()
 
 
+@njit(cache=True)
+def _first_fit_search(free_rects, count, width, height, tolerance):
+    """Index of the lowest-then-leftmost free rectangle fitting the piece, or -1"""
+    # Fold the slack into the piece once so the loop body is pure compares
+    min_width = width - tolerance
+    min_height = height - tolerance
+    best = -1
+    best_x = 0.0
+    best_y = 0.0
+    for k in range(count):
+        if min_width <= free_rects[2, k] and min_height <= free_rects[3, k]:
+            x = free_rects[0, k]
+            y = free_rects[1, k]
+            if best < 0 or y < best_y or (y == best_y and x < best_x):
+                best = k
+                best_x = x
+                best_y = y
+    return best
+
+
 class FirstFitAlgorithm(BaseAlgorithm):
     """
     First Fit Algorithm for 2D Cutting Optimization
@@ -57,10 +81,14 @@ class FirstFitAlgorithm(BaseAlgorithm):
 
     Methods:
         optimize: Execute First Fit optimization
-        _try_place_piece: Try to place a piece in stock
-        _find_valid_position: Find valid position for piece
+        _place_piece: Place a piece and split the free rectangle it used
+        _find_valid_position: Find lowest free corner fitting the piece
     """
     
+    # Slack for float round-off when free rectangles are carved from
+    # fractional sheet sizes (e.g. 1999.7mm)
+    FIT_TOLERANCE = 1e-9
+    
     def __init__(self):
         """
         Initialize First Fit algorithm.
@@ -77,18 +105,19 @@ class FirstFitAlgorithm(BaseAlgorithm):
         self.supports_rotation = True
         self.complexity = "O(n×m)"
     
-    def optimize(self, stocks: List[Dict], orders: List[Dict], 
-                config: OptimizationConfig) -> OptimizationResult:
+    def optimize(self, stocks: List[Stock], orders: List[Order], 
+                config: OptimizationConfig) -> CuttingResult:
         """
         Execute optimization using First Fit algorithm.
 
-        The algorithm processes each order in sequence and for each piece
-        attempts to place it in the first stock where it fits. If rotation
-        is enabled, it also tries 90° rotation before moving to next stock.
+        The algorithm processes every piece (largest area first unless
+        config.sort_pieces is disabled) and attempts to place it in the first
+        stock where it fits. If rotation is enabled, it also tries 90°
+        rotation before moving to next stock.
 
         Args:
-            stocks (List[Dict]): List of available stocks
-            orders (List[Dict]): List of cutting orders  
+            stocks (List[Stock]): List of available stocks
+            orders (List[Order]): List of cutting orders  
             config (OptimizationConfig): Optimization configuration
 
         Returns:
@@ -108,120 +137,178 @@ class FirstFitAlgorithm(BaseAlgorithm):
         if not stocks or not orders:
             raise ValueError("Stocks and orders cannot be empty")
         
-        logger.info(f"Starting First Fit optimization")
-        logger.info(f"Stocks: {len(stocks)}, Orders: {len(orders)}")
+        logger.logger.info(f"Starting First Fit optimization")
+        logger.logger.info(f"Stocks: {len(stocks)}, Orders: {len(orders)}")
         
-        # Initialize result
-        placed_shapes = []
-        total_pieces = sum(order.get('quantity', 1) for order in orders)
-        unfulfilled_orders = []
+        # Initialize result; placements are kept as plain tuples in the loop
+        # and expanded to placed shapes afterwards
+        placements = []
+        total_pieces = sum(order.quantity for order in orders)
         
         # Working copies
         working_stocks = []
         for i, stock in enumerate(stocks):
             working_stocks.append({
                 'id': i,
-                'width': stock['width'],
-                'height': stock['height'], 
-                'cost': stock.get('cost', 0),
-                'material': stock.get('material', 'default'),
-                'occupied_areas': []  # List of placed rectangles
+                'width': float(stock.width),
+                'height': float(stock.height), 
+                'cost': stock.total_cost,
+                'material': stock.material_type,
+                # Guillotine free rectangles as SoA rows x, y, width, height
+                'free_rects': self._new_free_rects(stock.width, stock.height),
+                'free_count': 1,
+                'remaining_area': float(stock.width) * float(stock.height)
             })
         
-        # Process each order
+        # Pieces only try stocks of their own material; a material with no
+        # matching stock falls back to every stock
+        stocks_by_material = defaultdict(list)
+        for stock in working_stocks:
+            stocks_by_material[stock['material']].append(stock)
+        
+        # Expand orders into units, numbered in input order so piece ids and
+        # the unfulfilled report do not depend on the placement order
+        pieces = []
         for order in orders:
-            quantity = order.get('quantity', 1)
-            order_id = order.get('id', 'unknown')
+            candidate_stocks = stocks_by_material.get(order.material_type, working_stocks)
+            
+            # Pieces are cut as their footprint box; shapes without one are
+            # left unfulfilled. Dimensions are cast once here so the search
+            # kernel always sees floats (sizes in mm may be fractional).
+            footprint = self._footprint(order.shape)
+            if footprint is None:
+                candidate_stocks = []
+                footprint = (0.0, 0.0)
+            piece_width, piece_height = footprint
+            
+            for piece_num in range(order.quantity):
+                pieces.append((len(pieces), f"{order.id}_{piece_num + 1}", order, 
+                               piece_width, piece_height, candidate_stocks))
+        
+        # First Fit Decreasing: largest area first, longer side breaking ties
+        # (the sort is stable, so equal pieces keep their input order)
+        if config.sort_pieces:
+            pieces.sort(key=lambda piece: (piece[3] * piece[4], max(piece[3], piece[4])), 
+                        reverse=True)
+        
+        unplaced = []
+        
+        # Hot-loop lookups bound once as locals
+        allow_rotation = config.allow_rotation
+        tolerance = self.FIT_TOLERANCE
+        find_position = self._find_valid_position
+        place_piece = self._place_piece
+        add_placement = placements.append
+        for piece in pieces:
+            _, piece_id, order, piece_width, piece_height, candidate_stocks = piece
+            piece_area = piece_width * piece_height
+            
+            # Whether the turned orientation is worth probing is fixed per
+            # piece, so it is settled once rather than per stock
+            try_rotated = allow_rotation and piece_width != piece_height
+            placed = False
             
-            for piece_num in range(quantity):
-                piece_id = f"{order_id}_{piece_num + 1}"
-                piece_width = order['width']
-                piece_height = order['height']
+            # Try to place in each stock (First Fit strategy)
+            for stock in candidate_stocks:
+                # Pieces never overlap, so a stock with less uncovered area
+                # than the piece cannot take it in either orientation
+                if piece_area > stock['remaining_area'] + tolerance:
+                    continue
                 
-                placed = False
+                # Try without rotation
+                position = find_position(stock, piece_width, piece_height)
                 
-                # Try to place in each stock (First Fit strategy)
-                for stock in working_stocks:
-                    # Try without rotation
-                    position = self._find_valid_position(
-                        stock, piece_width, piece_height
-                    )
+                if position:
+                    x, y, free_index = position
+                    place_piece(stock, x, y, piece_width, piece_height, free_index)
+                    add_placement((piece_id, order, stock['id'], x, y, False))
+                    placed = True
+                    break
+                
+                # Try with rotation (if enabled)
+                if try_rotated:
+                    position = find_position(stock, piece_height, piece_width)
                     
                     if position:
-                        x, y = position
-                        self._place_piece(stock, piece_id, x, y, piece_width, piece_height, False)
-                        placed_shapes.append({
-                            'piece_id': piece_id,
-                            'stock_id': stock['id'],
-                            'x': x,
-                            'y': y, 
-                            'width': piece_width,
-                            'height': piece_height,
-                            'rotated': False
-                        })
+                        x, y, free_index = position
+                        place_piece(stock, x, y, piece_height, piece_width, free_index)
+                        add_placement((piece_id, order, stock['id'], x, y, True))  # Rotated
                         placed = True
                         break
-                    
-                    # Try with rotation (if enabled)
-                    if config.allow_rotation and piece_width != piece_height:
-                        position = self._find_valid_position(
-                            stock, piece_height, piece_width
-                        )
-                        
-                        if position:
-                            x, y = position
-                            self._place_piece(stock, piece_id, x, y, piece_height, piece_width, True)
-                            placed_shapes.append({
-                                'piece_id': piece_id,
-                                'stock_id': stock['id'],
-                                'x': x,
-                                'y': y,
-                                'width': piece_height,  # Rotated
-                                'height': piece_width,  # Rotated
-                                'rotated': True
-                            })
-                            placed = True
-                            break
-                
-                # Track unfulfilled pieces
-                if not placed:
-                    unfulfilled_orders.append({
-                        'piece_id': piece_id,
-                        'width': piece_width,
-                        'height': piece_height,
-                        'order_id': order_id,
-                        'reason': 'No space available'
-                    })
+            
+            # Track unfulfilled pieces
+            if not placed:
+                unplaced.append(piece)
+        
+        # Unplaced units are reported as single-unit copies of their order,
+        # in input order
+        unplaced.sort()
+        unfulfilled_orders = []
+        for _, piece_id, order, _, _, _ in unplaced:
+            remaining_order = copy.copy(order)
+            remaining_order.shape = copy.copy(order.shape)
+            remaining_order.id = piece_id
+            remaining_order.quantity = 1
+            unfulfilled_orders.append(remaining_order)
+        
+        now = datetime.now()
+        placed_shapes = [PlacedShape.build(piece_id, self._placed_shape(order.shape, x, y, rotated), 
+                                           stocks[stock_index].id, now, 90.0 if rotated else 0.0)
+                         for piece_id, order, stock_index, x, y, rotated in placements]
         
         # Calculate metrics
         computation_time = time.time() - start_time
-        used_stocks = set(shape['stock_id'] for shape in placed_shapes)
+        used_stocks = set(stock_index for _, _, stock_index, _, _, _ in placements)
         
         # Calculate efficiency
-        total_placed_area = sum(shape['width'] * shape['height'] for shape in placed_shapes)
+        total_placed_area = sum(placed.shape.area() for placed in placed_shapes)
         total_stock_area = sum(
-            working_stocks[stock_id]['width'] * working_stocks[stock_id]['height']
-            for stock_id in used_stocks
+            working_stocks[stock_index]['width'] * working_stocks[stock_index]['height']
+            for stock_index in used_stocks
         )
         
-        efficiency = (total_placed_area / total_stock_area * 100) if total_stock_area > 0 else 0
+        efficiency = (total_placed_area / total_stock_area * 100) if total_stock_area > 0 else 0.0
         
-        logger.info(f"Optimization completed:")
-        logger.info(f"  - Placed pieces: {len(placed_shapes)}/{total_pieces}")
-        logger.info(f"  - Efficiency: {efficiency:.1f}%")
-        logger.info(f"  - Stocks used: {len(used_stocks)}")
-        logger.info(f"  - Time: {computation_time:.3f}s")
+        logger.logger.info(f"Optimization completed:")
+        logger.logger.info(f"  - Placed pieces: {len(placed_shapes)}/{total_pieces}")
+        logger.logger.info(f"  - Efficiency: {efficiency:.1f}%")
+        logger.logger.info(f"  - Stocks used: {len(used_stocks)}")
+        logger.logger.info(f"  - Time: {computation_time:.3f}s")
         
-        return OptimizationResult(
+        return CuttingResult(
             placed_shapes=placed_shapes,
             efficiency_percentage=efficiency,
             total_stock_used=len(used_stocks),
+            total_orders_fulfilled=len(set(order.id for _, order, _, _, _, _ in placements)),
             algorithm_used=self.name,
             computation_time=computation_time,
-            success=len(placed_shapes) > 0,
             unfulfilled_orders=unfulfilled_orders
         )
     
+    @staticmethod
+    def _footprint(shape):
+        """Width and height of the box a shape is cut from, or None if unsupported"""
+        if isinstance(shape, Rectangle):
+            return float(shape.width), float(shape.height)
+        if isinstance(shape, Circle):
+            return 2.0 * shape.radius, 2.0 * shape.radius
+        return None
+    
+    @staticmethod
+    def _placed_shape(shape, x: float, y: float, rotated: bool):
+        """Copy of an order's shape with its footprint's lower-left corner at (x, y)"""
+        placed = copy.copy(shape)
+        if isinstance(placed, Circle):
+            # Circles are positioned by their center
+            placed.x = x + placed.radius
+            placed.y = y + placed.radius
+        else:
+            placed.x = x
+            placed.y = y
+            if rotated:
+                placed.width, placed.height = placed.height, placed.width
+        return placed
+    
     def _find_valid_position(self, stock: Dict, width: float, height: float):
         """
         Find valid position for piece in stock
@@ -233,53 +320,66 @@ class FirstFitAlgorithm(BaseAlgorithm):
             config (OptimizationConfig): Configuration with rotation options
 
         Returns:
-            tuple: (x, y) position if found, None otherwise
+            tuple: (x, y, free rectangle index) if found, None otherwise
         """
         stock_width = stock['width']
         stock_height = stock['height']
         
         # Check if piece fits in stock at all
-        if width > stock_width or height > stock_height:
+        tolerance = self.FIT_TOLERANCE
+        if width > stock_width + tolerance or height > stock_height + tolerance:
             return None
         
-        # Try positions from top-left to bottom-right
-        for y in range(int(stock_height - height) + 1):
-            for x in range(int(stock_width - width) + 1):
-                
-                # Check overlap with existing pieces
-                piece_rect = Rectangle(x, y, width, height)
-                overlap = False
-                
-                for occupied in stock['occupied_areas']:
-                    occupied_rect = Rectangle(
-                        occupied['x'], occupied['y'],
-                        occupied['width'], occupied['height']
-                    )
-                    
-                    if self._rectangles_overlap(piece_rect, occupied_rect):
-                        overlap = True
-                        break
-                
-                if not overlap:
-                    return (x, y)
+        # Free rectangle corners are the candidate points; take the lowest,
+        # then leftmost, corner whose rectangle is large enough
+        free_rects = stock['free_rects']
+        if NUMBA_AVAILABLE:
+            index = _first_fit_search(free_rects, stock['free_count'], width, height, tolerance)
+            if index < 0:
+                return None
+        else:
+            free_x, free_y, free_width, free_height = free_rects[:, :stock['free_count']]
+            fitting = np.flatnonzero((free_width >= width - tolerance) & (free_height >= height - tolerance))
+            if fitting.size == 0:
+                return None
+            index = fitting[np.lexsort((free_x[fitting], free_y[fitting]))[0]]
         
-        return None
+        return free_rects[0, index].item(), free_rects[1, index].item(), int(index)
     
-    def _place_piece(self, stock: Dict, piece_id: str, x: float, y: float,
-                    width: float, height: float, rotated: bool):
-        """Add piece to stock's occupied areas"""
-        stock['occupied_areas'].append({
-            'piece_id': piece_id,
-            'x': x,
-            'y': y,
-            'width': width,
-            'height': height,
-            'rotated': rotated
-        })
+    def _place_piece(self, stock: Dict, x: float, y: float,
+                    width: float, height: float, free_index: int):
+        """Take a width x height piece out of the stock's free area and split
+        the free rectangle it landed in"""
+        stock['remaining_area'] -= width * height
+        
+        free_rects = stock['free_rects']
+        free_width, free_height = free_rects[2:, free_index].tolist()
+        
+        # Guillotine split along the free rectangle's shorter axis
+        if free_width < free_height:
+            right = (x + width, y, free_width - width, height)
+            top = (x, y + height, free_width, free_height - height)
+        else:
+            right = (x + width, y, free_width - width, free_height)
+            top = (x, y + height, width, free_height - height)
+        
+        # Children are disjoint, so dropping empty (or round-off sized) ones is
+        # the only pruning needed. Column order is irrelevant to the search, so
+        # the parent's column is refilled from the last one in O(1).
+        count = stock['free_count'] - 1
+        free_rects[:, free_index] = free_rects[:, count]
+        for rect in (right, top):
+            if rect[2] > self.FIT_TOLERANCE and rect[3] > self.FIT_TOLERANCE:
+                if count == free_rects.shape[1]:
+                    grown = np.empty((4, count * 2))
+                    grown[:, :count] = free_rects
+                    stock['free_rects'] = free_rects = grown
+                free_rects[:, count] = rect
+                count += 1
+        stock['free_count'] = count
     
-    def _rectangles_overlap(self, rect1: Rectangle, rect2: Rectangle) -> bool:
-        """Check if two rectangles overlap"""
-        return not (rect1.x + rect1.width <= rect2.x or
-                   rect2.x + rect2.width <= rect1.x or
-                   rect1.y + rect1.height <= rect2.y or
-                   rect2.y + rect2.height <= rect1.y) 
\ No newline at end of file
+    def _new_free_rects(self, width: float, height: float, capacity: int = 16) -> np.ndarray:
+        """Free rectangle buffer holding the whole sheet in its first column"""
+        free_rects = np.empty((4, capacity))
+        free_rects[:, 0] = (0, 0, width, height)
+        return free_rects
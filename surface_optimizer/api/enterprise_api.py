@@ -17,8 +17,13 @@ Designed for integration with:
 """
 
 import asyncio
+import itertools
+import os
+import threading
 import time
 import uuid
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, asdict
@@ -29,12 +34,25 @@ try:
     from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Path, Body
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.responses import JSONResponse
+    from fastapi.encoders import jsonable_encoder
     from pydantic import BaseModel, Field, validator
     import uvicorn
     FASTAPI_AVAILABLE = True
 except ImportError:
     FASTAPI_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import prometheus_client
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 from ..core.models import Surface, Piece, CuttingResult
 from ..algorithms.advanced.column_generation import IndustrialCuttingOptimizer
 from ..algorithms.advanced.hybrid_genetic import HybridGeneticAlgorithm
@@ -136,63 +154,142 @@ class SystemStatus(BaseModel):
     capabilities: Dict
 
 
+# Prometheus metrics, scraped from /metrics when prometheus_client is installed
+if PROMETHEUS_AVAILABLE:
+    JOBS_CREATED = prometheus_client.Counter(
+        'surface_optimizer_jobs_created', 'Optimization jobs submitted')
+    JOBS_FINISHED = prometheus_client.Counter(
+        'surface_optimizer_jobs_finished', 'Optimization jobs finished, by final status', ['status'])
+    OPTIMIZATION_DURATION = prometheus_client.Histogram(
+        'surface_optimizer_optimization_duration_seconds', 'Solver time per completed job')
+
+
 # Job Storage (In production, use Redis or database)
 class JobStorage:
-    """In-memory job storage for demo purposes"""
+    """In-memory job storage for demo purposes
+    
+    Holds at most MAX_JOBS jobs, evicting the oldest finished ones first.
+    Background tasks and request handlers share it, so access is locked.
+    """
+    
+    MAX_JOBS = 1000
+    ACTIVE_STATUSES = (OptimizationStatus.PENDING, OptimizationStatus.RUNNING)
     
     def __init__(self):
-        self.jobs: Dict[str, Dict] = {}
-        self.job_history: List[str] = []
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()  # Oldest first
+        self.job_history: deque = deque(maxlen=self.MAX_JOBS)
+        self._status_counts: Counter = Counter()
+        self._lock = threading.RLock()
     
     def create_job(self, job_id: str, request: OptimizationRequest) -> None:
         """Create new optimization job"""
-        self.jobs[job_id] = {
+        job = {
             'id': job_id,
             'status': OptimizationStatus.PENDING,
-            'request': request.dict(),
+            'request': request,  # Validated model, read by attribute
             'created_at': datetime.now(),
             'progress': 0,
             'result': None,
             'error': None
         }
-        self.job_history.append(job_id)
+        with self._lock:
+            previous = self.jobs.pop(job_id, None)
+            if previous is not None:
+                self._status_counts[previous['status']] -= 1
+            self.jobs[job_id] = job
+            self._status_counts[job['status']] += 1
+            self.job_history.append(job_id)
+            self._evict_finished()
+        
+        if PROMETHEUS_AVAILABLE:
+            JOBS_CREATED.inc()
     
-    def update_job(self, job_id: str, **updates) -> None:
-        """Update job with new information"""
-        if job_id in self.jobs:
-            self.jobs[job_id].update(updates)
+    def update_job(self, job_id: str, if_active: bool = False, **updates) -> bool:
+        """Update job with new information
+        
+        With if_active, the update only applies while the job is pending or
+        running, so a cancelled or finished job keeps its final status.
+        Returns whether the update was applied.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or (if_active and job['status'] not in self.ACTIVE_STATUSES):
+                return False
+            if 'status' in updates:
+                self._status_counts[job['status']] -= 1
+                self._status_counts[updates['status']] += 1
+                # Count a job once, when it first leaves the active statuses;
+                # a cancelled job later marked completed or failed is not recounted
+                finished = (job['status'] in self.ACTIVE_STATUSES and
+                            updates['status'] not in self.ACTIVE_STATUSES)
+                if PROMETHEUS_AVAILABLE and finished:
+                    JOBS_FINISHED.labels(status=OptimizationStatus(updates['status']).value).inc()
+            job.update(updates)
+            return True
     
     def get_job(self, job_id: str) -> Optional[Dict]:
         """Get job by ID"""
-        return self.jobs.get(job_id)
+        with self._lock:
+            return self.jobs.get(job_id)
     
     def get_active_jobs(self) -> List[Dict]:
         """Get all active jobs"""
-        return [job for job in self.jobs.values() 
-                if job['status'] in [OptimizationStatus.PENDING, OptimizationStatus.RUNNING]]
+        with self._lock:
+            return [job for job in self.jobs.values() if job['status'] in self.ACTIVE_STATUSES]
+    
+    def list_jobs(self, status: Optional[OptimizationStatus] = None, 
+                  limit: Optional[int] = None) -> List[Dict]:
+        """Get jobs newest first, optionally filtered by status"""
+        with self._lock:
+            # Stop walking back once limit jobs are found rather than
+            # collecting every match first
+            jobs = (job for job in reversed(self.jobs.values()) 
+                    if status is None or job['status'] == status)
+            return list(itertools.islice(jobs, limit))
     
     def get_job_stats(self) -> Dict:
         """Get job statistics"""
-        active = len([j for j in self.jobs.values() if j['status'] in [OptimizationStatus.PENDING, OptimizationStatus.RUNNING]])
-        completed = len([j for j in self.jobs.values() if j['status'] == OptimizationStatus.COMPLETED])
-        failed = len([j for j in self.jobs.values() if j['status'] == OptimizationStatus.FAILED])
+        with self._lock:
+            counts = self._status_counts
+            return {
+                'active': sum(counts[s] for s in self.ACTIVE_STATUSES),
+                'completed': counts[OptimizationStatus.COMPLETED],
+                'failed': counts[OptimizationStatus.FAILED],
+                'total': len(self.jobs)
+            }
+    
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs while over capacity (caller holds the lock)"""
+        excess = len(self.jobs) - self.MAX_JOBS
+        if excess <= 0:
+            return
         
-        return {
-            'active': active,
-            'completed': completed,
-            'failed': failed,
-            'total': len(self.jobs)
-        }
+        finished = []
+        for job_id, job in self.jobs.items():
+            if job['status'] not in self.ACTIVE_STATUSES:
+                finished.append(job_id)
+                if len(finished) == excess:
+                    break
+        for job_id in finished:
+            self._status_counts[self.jobs.pop(job_id)['status']] -= 1
 
 
 # Create FastAPI app if available
 if FASTAPI_AVAILABLE:
+    # orjson serializes large job listings (and datetimes) much faster than
+    # the stdlib encoder behind JSONResponse
+    if ORJSON_AVAILABLE:
+        from fastapi.responses import ORJSONResponse as DefaultResponse
+    else:
+        DefaultResponse = JSONResponse
+    
     app = FastAPI(
         title="Surface Cutting Optimizer API",
         description="Enterprise-grade REST API for industrial cutting stock optimization",
         version="1.0.0",
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        default_response_class=DefaultResponse
     )
     
     # Add CORS middleware for web integration
@@ -204,10 +301,40 @@ if FASTAPI_AVAILABLE:
         allow_headers=["*"],
     )
     
+    # Prometheus scrape endpoint, served outside the request handlers
+    if PROMETHEUS_AVAILABLE:
+        app.mount("/metrics", prometheus_client.make_asgi_app())
+    
     # Global instances
     job_storage = JobStorage()
     industrial_optimizer = IndustrialCuttingOptimizer()
     
+    # Optimizations are CPU-bound; workers keep them off the event loop. The
+    # pool lives with the server rather than the import, so importing the
+    # module starts no processes and shutdown reaps them.
+    optimization_executor: Optional[ProcessPoolExecutor] = None
+    
+    # Solver availability is fixed once the server is up, so the report is
+    # taken once per process and attached to every job result as is
+    solver_report: Optional[Dict[str, Any]] = None
+    
+    
+    @app.on_event("startup")
+    async def start_optimization_executor():
+        """Start the optimization worker pool"""
+        global optimization_executor, solver_report
+        optimization_executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+        solver_report = get_solver_status()
+    
+    
+    @app.on_event("shutdown")
+    async def stop_optimization_executor():
+        """Wait for running optimizations and stop the worker pool"""
+        global optimization_executor
+        if optimization_executor is not None:
+            optimization_executor.shutdown(wait=True)
+            optimization_executor = None
+    
     
     @app.get("/", response_model=Dict[str, str])
     async def root():
@@ -223,7 +350,7 @@ if FASTAPI_AVAILABLE:
     @app.get("/status", response_model=SystemStatus)
     async def get_system_status():
         """Get comprehensive system status"""
-        solver_status = get_solver_status()
+        solver_status = solver_report or get_solver_status()
         job_stats = job_storage.get_job_stats()
         
         return SystemStatus(
@@ -233,9 +360,8 @@ if FASTAPI_AVAILABLE:
             active_jobs=job_stats['active'],
             completed_jobs=job_stats['completed'],
             system_load={
-                "cpu_percent": 0,  # Could integrate psutil
-                "memory_percent": 0,
-                "active_optimizations": job_stats['active']
+                "active_optimizations": job_stats['active'],
+                "metrics_endpoint": "/metrics" if PROMETHEUS_AVAILABLE else None
             },
             capabilities={
                 "max_pieces_per_job": 10000,
@@ -302,41 +428,42 @@ if FASTAPI_AVAILABLE:
         )
     
     
-    @app.get("/jobs", response_model=List[OptimizationResult])
+    # Every OptimizationResult field, unset; listings fill in what the job has
+    JOB_LISTING_TEMPLATE = dict.fromkeys(OptimizationResult.__fields__)
+    
+    
+    @app.get("/jobs", response_model=None, response_class=DefaultResponse,
+             responses={200: {"model": List[OptimizationResult]}})
     async def list_optimization_jobs(
         status: Optional[OptimizationStatus] = Query(None, description="Filter by status"),
         limit: int = Query(100, ge=1, le=1000, description="Maximum number of jobs to return")
     ):
         """List optimization jobs with optional filtering"""
         
-        jobs = list(job_storage.jobs.values())
-        
-        # Filter by status if specified
-        if status:
-            jobs = [job for job in jobs if job['status'] == status]
-        
-        # Sort by creation time (newest first)
-        jobs.sort(key=lambda x: x['created_at'], reverse=True)
+        # Storage keeps creation order, so newest first needs no sort
+        jobs = job_storage.list_jobs(status, limit)
         
-        # Apply limit
-        jobs = jobs[:limit]
-        
-        # Convert to response models
+        # Project straight to OptimizationResult-shaped dicts; building and
+        # re-validating a model per job dominated large listings
         results = []
         for job in jobs:
-            results.append(OptimizationResult(
+            result = job['result'] or {}
+            entry = dict(JOB_LISTING_TEMPLATE)
+            entry.update(
                 job_id=job['id'],
                 status=job['status'],
-                efficiency=job.get('result', {}).get('efficiency'),
-                total_surfaces=job.get('result', {}).get('total_surfaces'),
-                computation_time=job.get('result', {}).get('computation_time'),
-                algorithm_used=job.get('result', {}).get('algorithm_used'),
+                efficiency=result.get('efficiency'),
+                total_surfaces=result.get('total_surfaces'),
+                computation_time=result.get('computation_time'),
+                algorithm_used=result.get('algorithm_used'),
                 created_at=job['created_at'],
                 completed_at=job.get('completed_at'),
                 error_message=job.get('error')
-            ))
+            )
+            results.append(entry)
         
-        return results
+        # The stdlib encoder behind JSONResponse cannot take datetimes
+        return DefaultResponse(content=results if ORJSON_AVAILABLE else jsonable_encoder(results))
     
     
     @app.delete("/jobs/{job_id}")
@@ -347,12 +474,11 @@ if FASTAPI_AVAILABLE:
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        if job['status'] in [OptimizationStatus.COMPLETED, OptimizationStatus.FAILED]:
+        # Only a pending or running job can be cancelled; checked under the
+        # storage lock, so a job finishing meanwhile keeps its result
+        if not job_storage.update_job(job_id, if_active=True, status=OptimizationStatus.CANCELLED):
             raise HTTPException(status_code=400, detail="Cannot cancel completed job")
         
-        # Update job status
-        job_storage.update_job(job_id, status=OptimizationStatus.CANCELLED)
-        
         return {"message": f"Job {job_id} cancelled successfully"}
     
     
@@ -382,6 +508,62 @@ if FASTAPI_AVAILABLE:
         return results
     
     
+    def _optimize_request(request: OptimizationRequest) -> Dict:
+        """Solve one request and summarize it (runs in a worker process)"""
+        # Convert request to internal models
+        surface = Surface(
+            width=request.surface.width,
+            height=request.surface.height
+        )
+        
+        # One validated Piece per requested size; units of the same size
+        # share it, since the optimizers only read piece dimensions
+        pieces = []
+        for piece_request in request.pieces:
+            piece = Piece(
+                width=piece_request.width,
+                height=piece_request.height
+            )
+            pieces.extend([piece] * piece_request.quantity)
+        
+        # Select algorithm
+        algorithm_name = request.algorithm or 'auto'
+        if algorithm_name == 'auto':
+            optimizer = industrial_optimizer
+        elif algorithm_name == 'genetic':
+            optimizer = GeneticAlgorithm()
+        elif algorithm_name == 'hybrid':
+            optimizer = HybridGeneticAlgorithm()
+        elif algorithm_name == 'column_generation':
+            optimizer = IndustrialCuttingOptimizer()
+        else:
+            optimizer = industrial_optimizer
+        
+        # Run optimization
+        start_time = time.time()
+        result = optimizer.optimize(surface, pieces)
+        computation_time = time.time() - start_time
+        
+        # Calculate cost analysis
+        surface_cost = request.surface.cost_per_unit or 0
+        total_cost = result.total_surfaces_used * surface_cost
+        
+        return {
+            'efficiency': result.efficiency,
+            'total_surfaces': result.total_surfaces_used,
+            'total_waste': getattr(result, 'total_waste', 0),
+            'computation_time': computation_time,
+            'algorithm_used': result.algorithm_name,
+            'problem_complexity': 'auto',  # Could analyze complexity
+            'patterns': [],  # Could serialize patterns
+            'cost_analysis': {
+                'total_cost': total_cost,
+                'cost_per_surface': surface_cost,
+                'waste_cost': getattr(result, 'total_waste', 0) * surface_cost / (surface.width * surface.height) if surface.width * surface.height > 0 else 0
+            }
+        }
+    
+    
     async def run_optimization(job_id: str):
         """Background task to run optimization"""
         try:
@@ -389,72 +571,25 @@ if FASTAPI_AVAILABLE:
             if not job:
                 return
             
-            # Update status to running
-            job_storage.update_job(job_id, status=OptimizationStatus.RUNNING, progress=10)
+            # Update status to running, unless the job was cancelled while pending
+            if not job_storage.update_job(job_id, if_active=True,
+                                          status=OptimizationStatus.RUNNING, progress=10):
+                return
             
-            # Convert request to internal models
-            request_data = job['request']
-            surface = Surface(
-                width=request_data['surface']['width'],
-                height=request_data['surface']['height']
+            # Solve in a worker process; awaiting it leaves the event loop
+            # free to serve other requests meanwhile
+            loop = asyncio.get_running_loop()
+            optimization_result = await loop.run_in_executor(
+                optimization_executor, _optimize_request, job['request']
             )
+            optimization_result['solver_info'] = solver_report
+            if PROMETHEUS_AVAILABLE:
+                OPTIMIZATION_DURATION.observe(optimization_result['computation_time'])
             
-            pieces = []
-            for piece_data in request_data['pieces']:
-                for _ in range(piece_data['quantity']):
-                    pieces.append(Piece(
-                        width=piece_data['width'],
-                        height=piece_data['height']
-                    ))
-            
-            # Update progress
-            job_storage.update_job(job_id, progress=30)
-            
-            # Select algorithm
-            algorithm_name = request_data.get('algorithm', 'auto')
-            if algorithm_name == 'auto':
-                optimizer = industrial_optimizer
-            elif algorithm_name == 'genetic':
-                optimizer = GeneticAlgorithm()
-            elif algorithm_name == 'hybrid':
-                optimizer = HybridGeneticAlgorithm()
-            elif algorithm_name == 'column_generation':
-                optimizer = IndustrialCuttingOptimizer()
-            else:
-                optimizer = industrial_optimizer
-            
-            # Update progress
-            job_storage.update_job(job_id, progress=50)
-            
-            # Run optimization
-            start_time = time.time()
-            result = optimizer.optimize(surface, pieces)
-            computation_time = time.time() - start_time
-            
-            # Calculate cost analysis
-            surface_cost = request_data['surface'].get('cost_per_unit', 0)
-            total_cost = result.total_surfaces_used * surface_cost
-            
-            # Prepare result
-            optimization_result = {
-                'efficiency': result.efficiency,
-                'total_surfaces': result.total_surfaces_used,
-                'total_waste': getattr(result, 'total_waste', 0),
-                'computation_time': computation_time,
-                'algorithm_used': result.algorithm_name,
-                'problem_complexity': 'auto',  # Could analyze complexity
-                'patterns': [],  # Could serialize patterns
-                'cost_analysis': {
-                    'total_cost': total_cost,
-                    'cost_per_surface': surface_cost,
-                    'waste_cost': getattr(result, 'total_waste', 0) * surface_cost / (surface.width * surface.height) if surface.width * surface.height > 0 else 0
-                },
-                'solver_info': get_solver_status()
-            }
-            
-            # Update job with results
+            # Update job with results; a job cancelled mid-solve stays cancelled
             job_storage.update_job(
                 job_id,
+                if_active=True,
                 status=OptimizationStatus.COMPLETED,
                 progress=100,
                 result=optimization_result,
@@ -462,15 +597,15 @@ if FASTAPI_AVAILABLE:
             )
             
         except Exception as e:
-            # Update job with error
+            # Update job with error, unless it was cancelled meanwhile
             job_storage.update_job(
                 job_id,
+                if_active=True,
                 status=OptimizationStatus.FAILED,
                 error=str(e),
                 completed_at=datetime.now()
             )
 
-
 def create_app() -> FastAPI:
     """Factory function to create FastAPI app"""
     if not FASTAPI_AVAILABLE:
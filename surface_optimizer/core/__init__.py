@@ -5,6 +5,8 @@ Contains fundamental classes and utilities
 
 from .models import Stock, Order, CuttingResult, PlacedShape, MaterialType, Priority, OptimizationConfig
 from .geometry import Shape, Rectangle, Circle, Polygon
+from .shape_array import ShapeArray, aabb_overlap_matrix
+from .stock_table import StockTable
 from .optimizer import Optimizer
 from .exceptions import (
     SurfaceOptimizerError,
@@ -26,6 +28,9 @@ __all__ = [
     "Rectangle",
     "Circle", 
     "Polygon",
+    "ShapeArray",
+    "aabb_overlap_matrix",
+    "StockTable",
     "Optimizer",
     "SurfaceOptimizerError",
     "InvalidDimensionsError",
@@ -0,0 +1,64 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Precompiled rectangle SAT kernels
+
+Optional C extension built by setup.py when Cython is installed. It mirrors
+rect_overlap_pairs in _geom_numba.py but needs no JIT warm-up; geometry.py
+falls back to the Python and numba paths when it is not built.
+"""
+
+import numpy as np
+from libc.math cimport fabs
+
+
+cdef inline bint _separated(double ux, double uy, double dx, double dy,
+                            double acos, double asin, double ahw, double ahh,
+                            double bcos, double bsin, double bhw, double bhh) nogil:
+    """True if (ux, uy) separates the rectangles (touching edges overlap)"""
+    cdef double radius_a = ahw * fabs(ux * acos + uy * asin) + ahh * fabs(uy * acos - ux * asin)
+    cdef double radius_b = bhw * fabs(ux * bcos + uy * bsin) + bhh * fabs(uy * bcos - ux * bsin)
+    return radius_a + radius_b < fabs(ux * dx + uy * dy)
+
+
+cdef inline bint _overlap(double ax, double ay, double acos, double asin, double ahw, double ahh,
+                          double bx, double by, double bcos, double bsin, double bhw, double bhh) nogil:
+    cdef double dx = bx - ax
+    cdef double dy = by - ay
+
+    # The unnormalized center axis projects the center gap to dx^2 + dy^2
+    cdef double radius_a = ahw * fabs(dx * acos + dy * asin) + ahh * fabs(dy * acos - dx * asin)
+    cdef double radius_b = bhw * fabs(dx * bcos + dy * bsin) + bhh * fabs(dy * bcos - dx * bsin)
+    if radius_a + radius_b < dx * dx + dy * dy:
+        return False
+
+    return not (_separated(acos, asin, dx, dy, acos, asin, ahw, ahh, bcos, bsin, bhw, bhh) or
+                _separated(-asin, acos, dx, dy, acos, asin, ahw, ahh, bcos, bsin, bhw, bhh) or
+                _separated(bcos, bsin, dx, dy, acos, asin, ahw, ahh, bcos, bsin, bhw, bhh) or
+                _separated(-bsin, bcos, dx, dy, acos, asin, ahw, ahh, bcos, bsin, bhw, bhh))
+
+
+cpdef bint rect_overlap(double ax, double ay, double acos, double asin, double ahw, double ahh,
+                        double bx, double by, double bcos, double bsin, double bhw, double bhh):
+    """Projection-radius SAT for two rectangles given by center, rotation
+    cos/sin and half extents; touching edges overlap"""
+    return _overlap(ax, ay, acos, asin, ahw, ahh, bx, by, bcos, bsin, bhw, bhh)
+
+
+def rect_overlap_batch(const double[::1] cx, const double[::1] cy,
+                       const double[::1] cos_r, const double[::1] sin_r,
+                       const double[::1] half_w, const double[::1] half_h,
+                       const long long[::1] idx_a, const long long[::1] idx_b):
+    """rect_overlap over pairs (idx_a[k], idx_b[k]) of SoA rectangles"""
+    cdef Py_ssize_t n = idx_a.shape[0]
+    cdef Py_ssize_t k
+    cdef long long i, j
+    result = np.empty(n, dtype=np.bool_)
+    cdef unsigned char[::1] out = result.view(np.uint8)
+
+    with nogil:
+        for k in range(n):
+            i = idx_a[k]
+            j = idx_b[k]
+            out[k] = _overlap(cx[i], cy[i], cos_r[i], sin_r[i], half_w[i], half_h[i],
+                              cx[j], cy[j], cos_r[j], sin_r[j], half_w[j], half_h[j])
+    return result
@@ -0,0 +1,91 @@
+"""
+CUDA kernel for batched rectangle overlap tests
+
+Mirrors rect_overlap_pairs in _geom_numba.py with one GPU thread per pair.
+Host-device copies only pay off for large batches (roughly 2k pairs and up),
+so smaller batches, and machines without numba or a CUDA device, use the CPU
+kernel instead.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from ._geom_numba import rect_overlap_pairs
+
+# Batches smaller than this stay on the CPU
+GPU_MIN_PAIRS = 2048
+THREADS_PER_BLOCK = 256
+
+
+@lru_cache(maxsize=1)
+def _load_cuda():
+    """numba.cuda and the compiled kernel, or None without numba or a device
+    
+    Deferred to the first batch big enough for the GPU and then cached, so
+    importing the package neither pays for the CUDA import nor starts the
+    driver in a process that may later fork workers.
+    """
+    try:
+        from numba import cuda
+    except ImportError:
+        return None
+    if not cuda.is_available():
+        return None
+    
+    @cuda.jit
+    def rect_overlap_kernel(cx, cy, cos_r, sin_r, half_w, half_h, idx_a, idx_b, out):
+        """Projection-radius SAT for pair k = idx_a[k], idx_b[k]; touching edges overlap"""
+        k = cuda.grid(1)
+        if k >= idx_a.shape[0]:
+            return
+        
+        i = idx_a[k]
+        j = idx_b[k]
+        dx = cx[j] - cx[i]
+        dy = cy[j] - cy[i]
+        radius_i = (half_w[i] * abs(dx * cos_r[i] + dy * sin_r[i]) +
+                    half_h[i] * abs(dy * cos_r[i] - dx * sin_r[i]))
+        radius_j = (half_w[j] * abs(dx * cos_r[j] + dy * sin_r[j]) +
+                    half_h[j] * abs(dy * cos_r[j] - dx * sin_r[j]))
+        overlap = not radius_i + radius_j < dx * dx + dy * dy
+        
+        for axis in range(4 if overlap else 0):
+            r = i if axis < 2 else j
+            if axis % 2 == 0:
+                ux = cos_r[r]
+                uy = sin_r[r]
+            else:
+                ux = -sin_r[r]
+                uy = cos_r[r]
+            
+            radius_i = (half_w[i] * abs(ux * cos_r[i] + uy * sin_r[i]) +
+                        half_h[i] * abs(uy * cos_r[i] - ux * sin_r[i]))
+            radius_j = (half_w[j] * abs(ux * cos_r[j] + uy * sin_r[j]) +
+                        half_h[j] * abs(uy * cos_r[j] - ux * sin_r[j]))
+            if radius_i + radius_j < abs(ux * dx + uy * dy):
+                overlap = False
+                break
+        
+        out[k] = overlap
+    
+    return cuda, rect_overlap_kernel
+
+
+def rect_overlap_pairs_gpu(cx, cy, cos_r, sin_r, half_w, half_h, idx_a, idx_b,
+                           min_pairs: int = GPU_MIN_PAIRS) -> np.ndarray:
+    """rect_overlap_pairs on the GPU when CUDA is available and the batch has
+    at least min_pairs pairs, otherwise on the CPU; same arguments and result"""
+    n = len(idx_a)
+    gpu = _load_cuda() if n >= min_pairs else None
+    if gpu is None:
+        return rect_overlap_pairs(cx, cy, cos_r, sin_r, half_w, half_h, idx_a, idx_b)
+    cuda, rect_overlap_kernel = gpu
+    
+    # One transfer per column for the whole batch
+    columns = [cuda.to_device(np.ascontiguousarray(column))
+               for column in (cx, cy, cos_r, sin_r, half_w, half_h, idx_a, idx_b)]
+    out = cuda.device_array(n, dtype=np.bool_)
+    blocks = (n + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    rect_overlap_kernel[blocks, THREADS_PER_BLOCK](*columns, out)
+    return out.copy_to_host()
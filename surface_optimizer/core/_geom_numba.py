@@ -0,0 +1,109 @@
+"""
+Compiled kernels for geometry overlap, area and containment tests, and
+for matching orders to stock sheets
+
+Kernels are compiled with numba when it is installed; without it the
+decorators are no-ops and the same loops run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels stay importable without numba"""
+        return lambda func: func
+
+
+@njit(parallel=True, cache=True)
+def rect_overlap_pairs(cx, cy, cos_r, sin_r, half_w, half_h, idx_a, idx_b):
+    """Projection-radius SAT for rectangle pairs (idx_a[k], idx_b[k]) given as
+    SoA center, rotation cos/sin and half extents; touching edges overlap.
+    Compiled without fastmath: touching pairs are exact ties, and contracted
+    or reordered sums could resolve them differently from Shape.overlaps"""
+    n = idx_a.shape[0]
+    result = np.empty(n, dtype=np.bool_)
+    for k in prange(n):
+        i = idx_a[k]
+        j = idx_b[k]
+        dx = cx[j] - cx[i]
+        dy = cy[j] - cy[i]
+        
+        # Center line first, as Rectangle.overlaps does, so ties on touching
+        # pairs resolve the same way; unnormalized, so no sqrt
+        radius_i = (half_w[i] * abs(dx * cos_r[i] + dy * sin_r[i]) + 
+                    half_h[i] * abs(dy * cos_r[i] - dx * sin_r[i]))
+        radius_j = (half_w[j] * abs(dx * cos_r[j] + dy * sin_r[j]) + 
+                    half_h[j] * abs(dy * cos_r[j] - dx * sin_r[j]))
+        overlap = not radius_i + radius_j < dx * dx + dy * dy
+        
+        # Candidate axes are the two local axes of each rectangle
+        for axis in range(4 if overlap else 0):
+            r = i if axis < 2 else j
+            if axis % 2 == 0:
+                ux = cos_r[r]
+                uy = sin_r[r]
+            else:
+                ux = -sin_r[r]
+                uy = cos_r[r]
+            
+            radius_i = (half_w[i] * abs(ux * cos_r[i] + uy * sin_r[i]) + 
+                        half_h[i] * abs(uy * cos_r[i] - ux * sin_r[i]))
+            radius_j = (half_w[j] * abs(ux * cos_r[j] + uy * sin_r[j]) + 
+                        half_h[j] * abs(uy * cos_r[j] - ux * sin_r[j]))
+            if radius_i + radius_j < abs(ux * dx + uy * dy):
+                overlap = False
+                break
+        
+        result[k] = overlap
+    return result
+
+
+@njit(fastmath=True, cache=True)
+def shoelace(vx, vy):
+    """Polygon area from SoA vertex coordinates using the shoelace formula"""
+    n = vx.shape[0]
+    area = 0.0
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        area += vx[i] * vy[j] - vx[j] * vy[i]
+    return abs(area) * 0.5
+
+
+@njit(cache=True)
+def point_in_poly(x, y, vx, vy):
+    """Ray casting toward +x over SoA vertex coordinates; odd crossings are inside.
+    Compiled without fastmath so boundary points resolve as in the NumPy path"""
+    n = vx.shape[0]
+    inside = False
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        x1 = vx[i]
+        y1 = vy[i]
+        x2 = vx[j]
+        y2 = vy[j]
+        if y > min(y1, y2) and y <= max(y1, y2) and x <= max(x1, x2):
+            if x1 == x2 or x <= (y - y1) * (x2 - x1) / (y2 - y1) + x1:
+                inside = not inside
+    return inside
+
+
+@njit(parallel=True, cache=True)
+def match_orders_to_stocks(o_mat, o_thick, o_tol, o_w, o_h, s_mat, s_thick, s_w, s_h, out):
+    """Fill out[i, j] with whether order i can be cut from stock j: same
+    material code, thickness within the order's tolerance and a sheet at
+    least o_w x o_h. Compiled without fastmath so inf sizes never fit"""
+    for i in prange(o_mat.shape[0]):
+        mat = o_mat[i]
+        thick = o_thick[i]
+        tol = o_tol[i]
+        need_w = o_w[i]
+        need_h = o_h[i]
+        for j in range(s_mat.shape[0]):
+            out[i, j] = (s_mat[j] == mat and abs(s_thick[j] - thick) <= tol and
+                         s_w[j] >= need_w and s_h[j] >= need_h)
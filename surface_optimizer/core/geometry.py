@@ -3,39 +3,93 @@ Geometric shapes and utilities for Surface Cutting Optimizer
 """
 
 import math
-from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Tuple, Union
 import numpy as np
 from .exceptions import InvalidDimensionsError, InvalidShapeError
+from ._geom_numba import point_in_poly, rect_overlap_pairs, shoelace
 
+try:
+    from ._geom import rect_overlap, rect_overlap_batch
+    GEOM_EXT_AVAILABLE = True
+except ImportError:
+    GEOM_EXT_AVAILABLE = False
 
-class Shape(ABC):
-    """Abstract base class for all geometric shapes"""
+# Exact values for quarter turns, so rotated boxes keep exact edges instead
+# of picking up 6e-17 terms from cos(pi / 2)
+_QUARTER_TURN_COS_SIN = {0: (1.0, 0.0), 90: (0.0, 1.0), 180: (-1.0, 0.0), 270: (0.0, -1.0)}
+
+
+@lru_cache(maxsize=512)
+def _cos_sin(degrees: float) -> Tuple[float, float]:
+    """cos and sin of an angle in degrees; layouts reuse a handful of angles"""
+    if degrees in _QUARTER_TURN_COS_SIN:
+        return _QUARTER_TURN_COS_SIN[degrees]
+    rad = math.radians(degrees)
+    return math.cos(rad), math.sin(rad)
+
+
+def _bounding_boxes_overlap(shape1: 'Shape', shape2: 'Shape') -> bool:
+    """Generic overlap test for shape pairs without an exact one (touching counts)"""
+    bbox1 = shape1.bounding_box()
+    bbox2 = shape2.bounding_box()
+    return not (bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0] or
+                bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1])
+
+
+class Shape:
+    """Base class for all geometric shapes
+    
+    Subclasses implement area, bounding_box, contains_point and overlaps.
+    Shapes are created and tested in the placement hot loops, so the
+    hierarchy uses __slots__ and plain methods rather than ABC dispatch.
+    """
+    
+    __slots__ = ('x', 'y', '_rotation', '_is_axis_aligned', '_trig')
+    
+    # Rotations this close to a full turn are snapped to 0 so that
+    # floating-point drift from repeated rotate() calls stays axis-aligned
+    AXIS_ALIGNED_TOLERANCE = 1e-9
     
     def __init__(self, x: float = 0, y: float = 0, rotation: float = 0):
         self.x = x
         self.y = y
-        self.rotation = rotation % 360
+        self.rotation = rotation
+        self._trig = (None, 1.0, 0.0)  # (rotation, cos, sin) last computed
+    
+    @property
+    def rotation(self) -> float:
+        return self._rotation
+    
+    @rotation.setter
+    def rotation(self, rotation: float):
+        # Normalized once here; hot paths test _is_axis_aligned instead
+        rotation = rotation % 360
+        if rotation != 0 and min(rotation, 360 - rotation) < self.AXIS_ALIGNED_TOLERANCE:
+            rotation = 0.0
+        self._rotation = rotation
+        self._is_axis_aligned = rotation == 0
     
-    @abstractmethod
     def area(self) -> float:
         """Calculate the area of the shape"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def bounding_box(self) -> Tuple[float, float, float, float]:
         """Return bounding box as (min_x, min_y, max_x, max_y)"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def contains_point(self, x: float, y: float) -> bool:
         """Check if a point is inside the shape"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def overlaps(self, other: 'Shape') -> bool:
         """Check if this shape overlaps with another shape"""
-        pass
+        raise NotImplementedError
+    
+    def fits_in_stock(self, width: float, height: float) -> bool:
+        """Check if the shape fits on a width x height stock sheet; shapes
+        without a fit test of their own never fit"""
+        return False
     
     def move(self, dx: float, dy: float):
         """Move the shape by (dx, dy)"""
@@ -44,12 +98,22 @@ class Shape(ABC):
     
     def rotate(self, angle: float):
         """Rotate the shape by angle degrees"""
-        self.rotation = (self.rotation + angle) % 360
+        self.rotation = self.rotation + angle
+    
+    def _rotation_trig(self) -> Tuple[float, float]:
+        """cos and sin of the rotation, recomputed only when it has changed"""
+        rotation, cos_r, sin_r = self._trig
+        if rotation != self._rotation:
+            cos_r, sin_r = _cos_sin(self._rotation)
+            self._trig = (self._rotation, cos_r, sin_r)
+        return cos_r, sin_r
 
 
 class Rectangle(Shape):
     """Rectangle shape"""
     
+    __slots__ = ('width', 'height')
+    
     def __init__(self, width: float, height: float, x: float = 0, y: float = 0, rotation: float = 0):
         if width <= 0 or height <= 0:
             raise InvalidDimensionsError(f"Rectangle dimensions must be positive: {width}x{height}")
@@ -63,19 +127,31 @@ class Rectangle(Shape):
     
     def bounding_box(self) -> Tuple[float, float, float, float]:
         """Return bounding box considering rotation"""
-        if self.rotation == 0:
+        if self._is_axis_aligned:
             return (self.x, self.y, self.x + self.width, self.y + self.height)
         
-        # For rotated rectangle, calculate all corners and find bounding box
-        corners = self._get_corners()
-        xs = [corner[0] for corner in corners]
-        ys = [corner[1] for corner in corners]
+        # The rotated box projects onto x and y with these half extents, so
+        # the box comes straight from the center without building corners
+        cos_r, sin_r = self._rotation_trig()
+        abs_cos = abs(cos_r)
+        abs_sin = abs(sin_r)
+        extent_x = 0.5 * (abs_cos * self.width + abs_sin * self.height)
+        extent_y = 0.5 * (abs_sin * self.width + abs_cos * self.height)
+        cx = self.x + self.width / 2
+        cy = self.y + self.height / 2
         
-        return (min(xs), min(ys), max(xs), max(ys))
+        return (cx - extent_x, cy - extent_y, cx + extent_x, cy + extent_y)
+    
+    def _half_axes(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """Half-width and half-height vectors of the rectangle after rotation"""
+        cos_r, sin_r = self._rotation_trig()
+        hw = self.width / 2
+        hh = self.height / 2
+        return (hw * cos_r, hw * sin_r), (-hh * sin_r, hh * cos_r)
     
     def _get_corners(self) -> List[Tuple[float, float]]:
         """Get the four corners of the rectangle considering rotation"""
-        if self.rotation == 0:
+        if self._is_axis_aligned:
             return [
                 (self.x, self.y),
                 (self.x + self.width, self.y),
@@ -83,59 +159,51 @@ class Rectangle(Shape):
                 (self.x, self.y + self.height)
             ]
         
-        # Rotate around center
+        # Rotate around center: each corner is the center plus or minus the
+        # two rotated half-axes (unrolled; four points are too few for NumPy)
         cx = self.x + self.width / 2
         cy = self.y + self.height / 2
+        (ax, ay), (bx, by) = self._half_axes()
         
-        # Half dimensions
-        hw = self.width / 2
-        hh = self.height / 2
-        
-        # Rotation in radians
-        rad = math.radians(self.rotation)
-        cos_r = math.cos(rad)
-        sin_r = math.sin(rad)
-        
-        # Calculate rotated corners
-        corners = []
-        for dx, dy in [(-hw, -hh), (hw, -hh), (hw, hh), (-hw, hh)]:
-            # Rotate point around origin
-            rx = dx * cos_r - dy * sin_r
-            ry = dx * sin_r + dy * cos_r
-            # Translate to rectangle center
-            corners.append((cx + rx, cy + ry))
-        
-        return corners
+        return [
+            (cx - ax - bx, cy - ay - by),
+            (cx + ax - bx, cy + ay - by),
+            (cx + ax + bx, cy + ay + by),
+            (cx - ax + bx, cy - ay + by)
+        ]
     
     def contains_point(self, x: float, y: float) -> bool:
         """Check if point is inside rectangle"""
-        if self.rotation == 0:
+        if self._is_axis_aligned:
             return (self.x <= x <= self.x + self.width and 
                     self.y <= y <= self.y + self.height)
         
-        # For rotated rectangle, transform point to local coordinate system
-        cx = self.x + self.width / 2
-        cy = self.y + self.height / 2
-        
-        # Translate to origin
-        px = x - cx
-        py = y - cy
-        
-        # Rotate point by negative angle
-        rad = math.radians(-self.rotation)
-        cos_r = math.cos(rad)
-        sin_r = math.sin(rad)
-        
-        local_x = px * cos_r - py * sin_r
-        local_y = px * sin_r + py * cos_r
-        
-        # Check if in local rectangle bounds
-        return (-self.width/2 <= local_x <= self.width/2 and 
-                -self.height/2 <= local_y <= self.height/2)
+        # For rotated rectangle, rotate the offset from the center back into
+        # the local frame; inside means both local overshoots are <= 0
+        local_x, local_y = self._to_local(x, y)
+        return max(abs(local_x) - self.width / 2, abs(local_y) - self.height / 2) <= 0
+    
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized contains_point over arrays of coordinates"""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        if self._is_axis_aligned:
+            return ((self.x <= xs) & (xs <= self.x + self.width) & 
+                    (self.y <= ys) & (ys <= self.y + self.height))
+        
+        local_x, local_y = self._to_local(xs, ys)
+        return np.maximum(np.abs(local_x) - self.width / 2, np.abs(local_y) - self.height / 2) <= 0
+    
+    def _to_local(self, x, y):
+        """Point(s) relative to the center, rotated by the negative angle"""
+        px = x - (self.x + self.width / 2)
+        py = y - (self.y + self.height / 2)
+        cos_r, sin_r = self._rotation_trig()
+        return px * cos_r + py * sin_r, py * cos_r - px * sin_r
     
     def fits_in_rectangle(self, container_width: float, container_height: float) -> bool:
         """Check if this rectangle fits in a container"""
-        if self.rotation == 0:
+        if self._is_axis_aligned:
             return (self.width <= container_width and 
                     self.height <= container_height)
         
@@ -147,65 +215,87 @@ class Rectangle(Shape):
         return (bbox_width <= container_width and 
                 bbox_height <= container_height)
     
+    fits_in_stock = fits_in_rectangle
+    
     def overlaps(self, other: 'Shape') -> bool:
         """Check overlap using Separating Axis Theorem (SAT)"""
         if isinstance(other, Rectangle):
             return self._overlaps_rectangle(other)
         elif isinstance(other, Circle):
-            return other.overlaps(self)  # Delegate to circle's implementation
+            return other._overlaps_rectangle(self)  # Straight to the circle's test
         else:
-            # Generic bounding box check for other shapes
-            bbox1 = self.bounding_box()
-            bbox2 = other.bounding_box()
-            return not (bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0] or
-                       bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1])
+            return _bounding_boxes_overlap(self, other)
     
     def _overlaps_rectangle(self, other: 'Rectangle') -> bool:
         """Check overlap with another rectangle using SAT"""
-        # Get corners of both rectangles
-        corners1 = self._get_corners()
-        corners2 = other._get_corners()
-        
-        # Get axes to test (edges of both rectangles)
-        axes = []
-        
-        # Add axes from first rectangle
-        for i in range(4):
-            edge = (corners1[(i+1)%4][0] - corners1[i][0], 
-                   corners1[(i+1)%4][1] - corners1[i][1])
-            # Perpendicular to edge
-            axis = (-edge[1], edge[0])
-            # Normalize
-            length = math.sqrt(axis[0]**2 + axis[1]**2)
-            if length > 0:
-                axes.append((axis[0]/length, axis[1]/length))
-        
-        # Add axes from second rectangle
-        for i in range(4):
-            edge = (corners2[(i+1)%4][0] - corners2[i][0], 
-                   corners2[(i+1)%4][1] - corners2[i][1])
-            # Perpendicular to edge
-            axis = (-edge[1], edge[0])
-            # Normalize
-            length = math.sqrt(axis[0]**2 + axis[1]**2)
-            if length > 0:
-                axes.append((axis[0]/length, axis[1]/length))
-        
-        # Test each axis
-        for axis in axes:
-            # Project both rectangles onto axis
-            proj1 = [corner[0] * axis[0] + corner[1] * axis[1] for corner in corners1]
-            proj2 = [corner[0] * axis[0] + corner[1] * axis[1] for corner in corners2]
-            
-            min1, max1 = min(proj1), max(proj1)
-            min2, max2 = min(proj2), max(proj2)
-            
-            # Check for separation
-            if max1 < min2 or max2 < min1:
+        # Axis-aligned fast path: SAT reduces to interval tests on x and y
+        if self._is_axis_aligned and other._is_axis_aligned:
+            return not (self.x + self.width < other.x or other.x + other.width < self.x or
+                        self.y + self.height < other.y or other.y + other.height < self.y)
+        
+        # Projection-radius SAT: on a unit axis u each rectangle projects to
+        # its center plus or minus hw*|u.ex| + hh*|u.ey|, so the only
+        # candidate axes are the two local axes of each rectangle
+        cos1, sin1 = self._rotation_trig()
+        cos2, sin2 = other._rotation_trig()
+        hw1 = self.width / 2
+        hh1 = self.height / 2
+        hw2 = other.width / 2
+        hh2 = other.height / 2
+        
+        if GEOM_EXT_AVAILABLE:
+            return rect_overlap(self.x + hw1, self.y + hh1, cos1, sin1, hw1, hh1, 
+                                other.x + hw2, other.y + hh2, cos2, sin2, hw2, hh2)
+        
+        dx = (other.x + hw2) - (self.x + hw1)
+        dy = (other.y + hh2) - (self.y + hh1)
+        
+        # The line joining the centers most often separates disjoint pairs;
+        # on the unnormalized axis (dx, dy) the center gap projects to
+        # dx^2 + dy^2, so no sqrt is needed
+        radius1 = hw1 * abs(dx * cos1 + dy * sin1) + hh1 * abs(dy * cos1 - dx * sin1)
+        radius2 = hw2 * abs(dx * cos2 + dy * sin2) + hh2 * abs(dy * cos2 - dx * sin2)
+        if radius1 + radius2 < dx * dx + dy * dy:
+            return False
+        
+        # Rotations a multiple of 90 degrees apart share their axes
+        axes = [(cos1, sin1), (-sin1, cos1)]
+        if (self._rotation - other._rotation) % 90 != 0:
+            axes += [(cos2, sin2), (-sin2, cos2)]
+        
+        for ux, uy in axes:
+            radius1 = hw1 * abs(ux * cos1 + uy * sin1) + hh1 * abs(uy * cos1 - ux * sin1)
+            radius2 = hw2 * abs(ux * cos2 + uy * sin2) + hh2 * abs(uy * cos2 - ux * sin2)
+            if radius1 + radius2 < abs(ux * dx + uy * dy):
                 return False  # Separating axis found
         
         return True  # No separating axis found, they overlap
     
+    @classmethod
+    def batch_overlap(cls, rects_a: List['Rectangle'], rects_b: List['Rectangle']) -> np.ndarray:
+        """Overlap matrix (len(rects_a), len(rects_b)) matching overlaps() pairwise,
+        computed in one compiled call instead of a Python loop per pair"""
+        rects = list(rects_a) + list(rects_b)
+        if not rects_a or not rects_b:
+            return np.zeros((len(rects_a), len(rects_b)), dtype=bool)
+        
+        width, height, x, y, cos_r, sin_r = np.array(
+            [(r.width, r.height, r.x, r.y) + r._rotation_trig() for r in rects], dtype=float).T
+        half_w = width / 2
+        half_h = height / 2
+        
+        idx_a, idx_b = np.meshgrid(np.arange(len(rects_a)), 
+                                   np.arange(len(rects_a), len(rects)), indexing='ij')
+        # The precompiled extension needs no JIT warm-up, so prefer it when built
+        pair_overlap = rect_overlap_batch if GEOM_EXT_AVAILABLE else rect_overlap_pairs
+        overlaps = pair_overlap(x + half_w, y + half_h, cos_r, sin_r, half_w, half_h, 
+                                idx_a.ravel().astype(np.int64), idx_b.ravel().astype(np.int64))
+        return overlaps.reshape(idx_a.shape)
+    
+    def __copy__(self) -> 'Rectangle':
+        """Lightweight copy; all fields are immutable scalars"""
+        return Rectangle(self.width, self.height, self.x, self.y, self.rotation)
+    
     def __str__(self):
         return f"Rectangle({self.width}x{self.height} at {self.x},{self.y}, rot={self.rotation}°)"
 
@@ -213,6 +303,8 @@ class Rectangle(Shape):
 class Circle(Shape):
     """Circle shape"""
     
+    __slots__ = ('radius',)
+    
     def __init__(self, radius: float, x: float = 0, y: float = 0):
         if radius <= 0:
             raise InvalidDimensionsError(f"Circle radius must be positive: {radius}")
@@ -228,83 +320,46 @@ class Circle(Shape):
                 self.x + self.radius, self.y + self.radius)
     
     def contains_point(self, x: float, y: float) -> bool:
-        distance = math.sqrt((x - self.x)**2 + (y - self.y)**2)
-        return distance <= self.radius
+        dx = x - self.x
+        dy = y - self.y
+        return dx * dx + dy * dy <= self.radius * self.radius
     
     def fits_in_rectangle(self, container_width: float, container_height: float) -> bool:
         """Check if circle fits in rectangle"""
         return (2 * self.radius <= container_width and 
                 2 * self.radius <= container_height)
     
+    fits_in_stock = fits_in_rectangle
+    
     def overlaps(self, other: 'Shape') -> bool:
         """Check overlap with another shape"""
         if isinstance(other, Circle):
-            # Circle-circle overlap
-            distance = math.sqrt((other.x - self.x)**2 + (other.y - self.y)**2)
-            return distance <= (self.radius + other.radius)
+            # Circle-circle overlap, compared squared to skip the sqrt
+            dx = other.x - self.x
+            dy = other.y - self.y
+            reach = self.radius + other.radius
+            return dx * dx + dy * dy <= reach * reach
         
         elif isinstance(other, Rectangle):
             # Circle-rectangle overlap
             return self._overlaps_rectangle(other)
         
         else:
-            # Generic bounding box check
-            bbox1 = self.bounding_box()
-            bbox2 = other.bounding_box()
-            return not (bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0] or
-                       bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1])
+            return _bounding_boxes_overlap(self, other)
     
     def _overlaps_rectangle(self, rect: Rectangle) -> bool:
         """Check if circle overlaps with rectangle"""
-        # Find closest point on rectangle to circle center
-        rect_corners = rect._get_corners()
-        
-        # For rotated rectangle, this is complex. Use simplified approach:
-        # Check if circle center is inside rectangle or if circle intersects any edge
-        
-        if rect.contains_point(self.x, self.y):
-            return True
-        
-        # Check distance to each edge
-        for i in range(4):
-            p1 = rect_corners[i]
-            p2 = rect_corners[(i+1) % 4]
-            
-            # Distance from circle center to line segment
-            dist = self._point_to_segment_distance(self.x, self.y, p1[0], p1[1], p2[0], p2[1])
-            
-            if dist <= self.radius:
-                return True
-        
-        return False
-    
-    def _point_to_segment_distance(self, px: float, py: float, 
-                                 x1: float, y1: float, x2: float, y2: float) -> float:
-        """Calculate distance from point to line segment"""
-        A = px - x1
-        B = py - y1
-        C = x2 - x1
-        D = y2 - y1
-        
-        dot = A * C + B * D
-        len_sq = C * C + D * D
-        
-        if len_sq == 0:
-            return math.sqrt(A * A + B * B)
-        
-        param = dot / len_sq
-        
-        if param < 0:
-            xx, yy = x1, y1
-        elif param > 1:
-            xx, yy = x2, y2
-        else:
-            xx = x1 + param * C
-            yy = y1 + param * D
-        
-        dx = px - xx
-        dy = py - yy
-        return math.sqrt(dx * dx + dy * dy)
+        # In the rectangle's local frame, the overshoot of the center past
+        # each half extent (clamped at 0) is the offset to the nearest point
+        # of the rectangle; the circle reaches it if that is within the radius
+        local_x, local_y = rect._to_local(self.x, self.y)
+        qx = max(abs(local_x) - rect.width / 2, 0.0)
+        qy = max(abs(local_y) - rect.height / 2, 0.0)
+        return qx * qx + qy * qy <= self.radius * self.radius
+    
+    def __copy__(self) -> 'Circle':
+        """Lightweight copy; all fields are immutable scalars"""
+        return Circle(self.radius, self.x, self.y)
     
     def __str__(self):
         return f"Circle(r={self.radius} at {self.x},{self.y})"
@@ -313,24 +368,31 @@ class Circle(Shape):
 class Polygon(Shape):
     """Polygon shape defined by vertices"""
     
+    __slots__ = ('_vertices', '_vx', '_vy', '_transformed')
+    
     def __init__(self, vertices: List[Tuple[float, float]], x: float = 0, y: float = 0, rotation: float = 0):
         if len(vertices) < 3:
             raise InvalidShapeError(f"Polygon must have at least 3 vertices, got {len(vertices)}")
         
         super().__init__(x, y, rotation)
         self.vertices = vertices
+        self._transformed = (None, None, None)  # (x, y, rotation) key, then transformed xs, ys
+    
+    @property
+    def vertices(self) -> List[Tuple[float, float]]:
+        return self._vertices
+    
+    @vertices.setter
+    def vertices(self, vertices: List[Tuple[float, float]]):
+        self._vertices = vertices
+        coords = np.asarray(vertices, dtype=np.float64)
+        self._vx = np.ascontiguousarray(coords[:, 0])
+        self._vy = np.ascontiguousarray(coords[:, 1])
+        self._transformed = (None, None, None)
     
     def area(self) -> float:
         """Calculate area using shoelace formula"""
-        n = len(self.vertices)
-        area = 0.0
-        
-        for i in range(n):
-            j = (i + 1) % n
-            area += self.vertices[i][0] * self.vertices[j][1]
-            area -= self.vertices[j][0] * self.vertices[i][1]
-        
-        return abs(area) / 2.0
+        return float(shoelace(self._vx, self._vy))
     
     def bounding_box(self) -> Tuple[float, float, float, float]:
         """Get bounding box of polygon"""
@@ -343,13 +405,11 @@ class Polygon(Shape):
     
     def _get_transformed_vertices(self) -> List[Tuple[float, float]]:
         """Get vertices transformed by position and rotation"""
-        if self.rotation == 0:
+        if self._is_axis_aligned:
             return [(v[0] + self.x, v[1] + self.y) for v in self.vertices]
         
         # Apply rotation and translation
-        rad = math.radians(self.rotation)
-        cos_r = math.cos(rad)
-        sin_r = math.sin(rad)
+        cos_r, sin_r = self._rotation_trig()
         
         transformed = []
         for vx, vy in self.vertices:
@@ -361,33 +421,45 @@ class Polygon(Shape):
         
         return transformed
     
+    def _transformed_xy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Transformed vertex coordinates as contiguous arrays, reused until the pose changes"""
+        key = (self.x, self.y, self._rotation)
+        cached_key, xs, ys = self._transformed
+        if cached_key != key:
+            if self._is_axis_aligned:
+                xs = self._vx + self.x
+                ys = self._vy + self.y
+            else:
+                cos_r, sin_r = self._rotation_trig()
+                xs = self._vx * cos_r - self._vy * sin_r + self.x
+                ys = self._vx * sin_r + self._vy * cos_r + self.y
+            self._transformed = (key, xs, ys)
+        return xs, ys
+    
     def contains_point(self, x: float, y: float) -> bool:
         """Check if point is inside polygon using ray casting"""
-        vertices = self._get_transformed_vertices()
-        n = len(vertices)
-        inside = False
+        return bool(point_in_poly(float(x), float(y), *self._transformed_xy()))
+    
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized ray casting: count, per query point, the edges a ray to
+        +x crosses (broadcast as points x edges); odd means inside"""
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1, 1)
+        ys = np.asarray(ys, dtype=np.float64).reshape(-1, 1)
         
-        p1x, p1y = vertices[0]
-        for i in range(1, n + 1):
-            p2x, p2y = vertices[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
+        x1, y1 = self._transformed_xy()
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
         
-        return inside
+        # Horizontal edges never pass the y test, so their inf/nan is unused
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xinters = (ys - y1) * (x2 - x1) / (y2 - y1) + x1
+        crossings = ((ys > np.minimum(y1, y2)) & (ys <= np.maximum(y1, y2)) & 
+                     (xs <= np.maximum(x1, x2)) & ((x1 == x2) | (xs <= xinters)))
+        return crossings.sum(axis=1) % 2 == 1
     
     def overlaps(self, other: 'Shape') -> bool:
         """Check overlap with another shape"""
         # Simplified: use bounding box check
-        bbox1 = self.bounding_box()
-        bbox2 = other.bounding_box()
-        return not (bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0] or
-                   bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1])
+        return _bounding_boxes_overlap(self, other)
     
     def __str__(self):
         return f"Polygon({len(self.vertices)} vertices at {self.x},{self.y}, rot={self.rotation}°)" 
\ No newline at end of file
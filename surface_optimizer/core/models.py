@@ -4,15 +4,59 @@ Enhanced data structures with logging and advanced features
 """
 
 from typing import List, Optional, Dict, Any, Tuple, Union
+from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime, timedelta
-from .geometry import Shape, Rectangle, Circle
+from functools import cached_property
+from datetime import date, datetime, time, timedelta
+from .geometry import Shape
 from .exceptions import InvalidDimensionsError, ValidationError
 import json
+import os
+import sys
+import numpy as np
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class MaterialType(Enum):
+
+def _json_default(obj: Any) -> Any:
+    """Encode the values orjson handles natively (dates, NumPy scalars and
+    arrays) the same way for the stdlib json fallback"""
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON, with orjson's C encoder when
+    installed; non-string keys are written as strings like json.dump does"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+# slots=True needs Python 3.10+; older interpreters keep __dict__-backed
+# instances. Stock keeps its __dict__ for its cached_property measures.
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+class _IdentityHashEnum(Enum):
+    """Enum hashed by identity
+    
+    Members are singletons compared by identity, so object.__hash__ is
+    consistent with equality and skips Enum's Python-level hash of the name;
+    this matters where members key dicts, e.g. grouping stocks by material.
+    """
+    __hash__ = object.__hash__
+
+
+class MaterialType(_IdentityHashEnum):
     """Types of materials that can be cut"""
     GLASS = "glass"
     METAL = "metal" 
@@ -27,13 +71,21 @@ class MaterialType(Enum):
     @classmethod
     def from_string(cls, value: str) -> 'MaterialType':
         """Create MaterialType from string"""
-        for material in cls:
-            if material.value.lower() == value.lower():
-                return material
-        raise ValueError(f"Unknown material type: {value}")
+        try:
+            return cls._by_value[value.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown material type: {value}") from None
 
 
-class Priority(Enum):
+# Lookup tables and cached strings are set after class creation; in the
+# class body they would become enum members. Serialization reads the plain
+# _serialized attributes, skipping the .value/.name descriptors.
+MaterialType._by_value = {material.value.lower(): material for material in MaterialType}
+for material in MaterialType:
+    material._serialized = material.value
+
+
+class Priority(_IdentityHashEnum):
     """Order priority levels with weights"""
     LOW = (1, "Low Priority")
     MEDIUM = (2, "Medium Priority")
@@ -47,13 +99,18 @@ class Priority(Enum):
     @classmethod
     def from_weight(cls, weight: int) -> 'Priority':
         """Get priority from weight value"""
-        for priority in cls:
-            if priority.weight == weight:
-                return priority
-        raise ValueError(f"Unknown priority weight: {weight}")
+        try:
+            return cls._by_weight[weight]
+        except KeyError:
+            raise ValueError(f"Unknown priority weight: {weight}") from None
+
+
+Priority._by_weight = {priority.weight: priority for priority in Priority}
+for priority in Priority:
+    priority._serialized_name = priority.name
 
 
-class StockStatus(Enum):
+class StockStatus(_IdentityHashEnum):
     """Stock availability status"""
     AVAILABLE = "available"
     RESERVED = "reserved"
@@ -62,7 +119,11 @@ class StockStatus(Enum):
     MAINTENANCE = "maintenance"
 
 
-class OrderStatus(Enum):
+for status in StockStatus:
+    status._serialized = status.value
+
+
+class OrderStatus(_IdentityHashEnum):
     """Order processing status"""
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -72,9 +133,13 @@ class OrderStatus(Enum):
     ON_HOLD = "on_hold"
 
 
-@dataclass
+for status in OrderStatus:
+    status._serialized = status.value
+
+
+@dataclass(frozen=True, **_SLOTS)
 class MaterialProperties:
-    """Properties specific to material types"""
+    """Properties specific to material types (immutable, so defaults are shared)"""
     density: float = 1.0  # kg/m²
     cost_per_area: float = 0.0  # currency per m²
     cutting_speed: float = 1.0  # relative cutting speed
@@ -86,19 +151,28 @@ class MaterialProperties:
     @classmethod
     def get_default_properties(cls, material_type: MaterialType) -> 'MaterialProperties':
         """Get default properties for material type"""
-        defaults = {
-            MaterialType.GLASS: cls(density=2.5, cost_per_area=15.0, cutting_speed=0.8, waste_factor=0.08),
-            MaterialType.METAL: cls(density=7.8, cost_per_area=25.0, cutting_speed=0.6, waste_factor=0.05),
-            MaterialType.WOOD: cls(density=0.6, cost_per_area=10.0, cutting_speed=1.2, waste_factor=0.10),
-            MaterialType.PLASTIC: cls(density=1.4, cost_per_area=8.0, cutting_speed=1.0, waste_factor=0.06),
-            MaterialType.FABRIC: cls(density=0.3, cost_per_area=20.0, cutting_speed=1.5, waste_factor=0.15),
-        }
-        return defaults.get(material_type, cls())
+        return _DEFAULT_MATERIAL_PROPERTIES.get(material_type) or cls()
+
+
+# Built once at import; every stock without explicit properties shares these
+_DEFAULT_MATERIAL_PROPERTIES: Dict[MaterialType, MaterialProperties] = {
+    MaterialType.GLASS: MaterialProperties(density=2.5, cost_per_area=15.0, cutting_speed=0.8, waste_factor=0.08),
+    MaterialType.METAL: MaterialProperties(density=7.8, cost_per_area=25.0, cutting_speed=0.6, waste_factor=0.05),
+    MaterialType.WOOD: MaterialProperties(density=0.6, cost_per_area=10.0, cutting_speed=1.2, waste_factor=0.10),
+    MaterialType.PLASTIC: MaterialProperties(density=1.4, cost_per_area=8.0, cutting_speed=1.0, waste_factor=0.06),
+    MaterialType.FABRIC: MaterialProperties(density=0.3, cost_per_area=20.0, cutting_speed=1.5, waste_factor=0.15),
+}
 
 
 @dataclass
 class Stock:
-    """Enhanced stock representation with tracking and validation"""
+    """Enhanced stock representation with tracking and validation
+    
+    Derived measures (area, volume, weight, cost) are computed on first
+    access and cached, so dimensions, thickness, cost and material
+    properties are fixed once the stock is built; use dataclasses.replace
+    to get a stock with different ones.
+    """
     id: str
     width: float
     height: float
@@ -126,27 +200,27 @@ class Stock:
         if self.material_properties is None:
             self.material_properties = MaterialProperties.get_default_properties(self.material_type)
     
-    @property
+    @cached_property
     def area(self) -> float:
         """Calculate area in mm²"""
         return self.width * self.height
     
-    @property
+    @cached_property
     def area_m2(self) -> float:
         """Calculate area in m²"""
         return self.area / 1_000_000
     
-    @property
+    @cached_property
     def volume(self) -> float:
         """Calculate volume in mm³"""
         return self.area * self.thickness
     
-    @property
+    @cached_property
     def weight_kg(self) -> float:
         """Estimate weight in kg"""
         return self.area_m2 * self.thickness * self.material_properties.density / 1000
     
-    @property
+    @cached_property
     def total_cost(self) -> float:
         """Calculate total cost"""
         if self.cost_per_unit > 0:
@@ -161,18 +235,17 @@ class Stock:
     @property
     def is_expired(self) -> bool:
         """Check if stock has expired"""
+        return self._is_expired(datetime.now())
+    
+    def _is_expired(self, now: datetime) -> bool:
+        """is_expired against a timestamp supplied by the caller"""
         if self.expiry_date is None:
             return False
-        return datetime.now() > self.expiry_date
+        return now > self.expiry_date
     
     def can_fit_shape(self, shape: Shape) -> bool:
         """Check if a shape can fit in this stock"""
-        if isinstance(shape, Rectangle):
-            return shape.fits_in_rectangle(self.width, self.height)
-        elif isinstance(shape, Circle):
-            return (2 * shape.radius <= self.width and 
-                   2 * shape.radius <= self.height)
-        return False
+        return shape.fits_in_stock(self.width, self.height)
     
     def reserve(self) -> bool:
         """Reserve this stock for use"""
@@ -188,21 +261,35 @@ class Stock:
             return True
         return False
     
-    def validate(self) -> List[str]:
-        """Validate stock and return list of issues"""
+    def validate(self, now: Optional[datetime] = None) -> List[str]:
+        """Validate stock and return list of issues
+        
+        Args:
+            now: Reference time for the expiry check, defaults to datetime.now()
+        """
+        now = now or datetime.now()
         issues = []
         
-        if self.is_expired:
+        if self._is_expired(now):
             issues.append(f"Stock {self.id} has expired")
         
         if not self.is_available:
-            issues.append(f"Stock {self.id} is not available (status: {self.status.value})")
+            issues.append(f"Stock {self.id} is not available (status: {self.status._serialized})")
         
         if self.area < 1000:  # Less than 1000 mm²
             issues.append(f"Stock {self.id} area is very small: {self.area:.1f} mm²")
         
         return issues
     
+    @classmethod
+    def validate_many(cls, stocks: List['Stock'], now: Optional[datetime] = None) -> List[str]:
+        """Validate several stocks against one timestamp and collect their issues"""
+        now = now or datetime.now()
+        issues = []
+        for stock in stocks:
+            issues.extend(stock.validate(now))
+        return issues
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
@@ -210,10 +297,10 @@ class Stock:
             "width": self.width,
             "height": self.height,
             "thickness": self.thickness,
-            "material_type": self.material_type.value,
+            "material_type": self.material_type._serialized,
             "cost_per_unit": self.cost_per_unit,
             "location": self.location,
-            "status": self.status.value,
+            "status": self.status._serialized,
             "area": self.area,
             "total_cost": self.total_cost,
             "tags": self.tags,
@@ -221,10 +308,10 @@ class Stock:
         }
     
     def __str__(self):
-        return f"Stock({self.id}: {self.width}x{self.height}x{self.thickness}mm, {self.material_type.value}, {self.status.value})"
+        return f"Stock({self.id}: {self.width}x{self.height}x{self.thickness}mm, {self.material_type._serialized}, {self.status._serialized})"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Order:
     """Enhanced order representation with tracking and validation"""
     id: str
@@ -271,23 +358,31 @@ class Order:
     @property
     def is_overdue(self) -> bool:
         """Check if order is overdue"""
-        if self.due_date is None:
-            return False
-        return datetime.now() > self.due_date
+        return self._is_overdue(datetime.now())
     
     @property
     def days_until_due(self) -> Optional[int]:
         """Calculate days until due date"""
+        return self._days_until_due(datetime.now())
+    
+    def _is_overdue(self, now: datetime) -> bool:
+        """is_overdue against a timestamp supplied by the caller"""
+        if self.due_date is None:
+            return False
+        return now > self.due_date
+    
+    def _days_until_due(self, now: datetime) -> Optional[int]:
+        """days_until_due against a timestamp supplied by the caller"""
         if self.due_date is None:
             return None
-        delta = self.due_date - datetime.now()
-        return delta.days
+        return (self.due_date - now).days
     
     def can_be_fulfilled_by_stock(self, stock: Stock) -> bool:
         """Check if this order can be fulfilled by given stock"""
-        return (self.material_type == stock.material_type and
+        # Cheapest and most selective checks first; enum members are singletons
+        return (self.material_type is stock.material_type and
                 abs(self.thickness - stock.thickness) <= self.tolerance and
-                stock.can_fit_shape(self.shape))
+                self.shape.fits_in_stock(stock.width, stock.height))
     
     def mark_fulfilled(self, fulfilled_quantity: int = None):
         """Mark order as fulfilled"""
@@ -296,32 +391,47 @@ class Order:
         else:
             self.status = OrderStatus.PARTIALLY_FULFILLED
     
-    def validate(self) -> List[str]:
-        """Validate order and return list of issues"""
+    def validate(self, now: Optional[datetime] = None) -> List[str]:
+        """Validate order and return list of issues
+        
+        Args:
+            now: Reference time for the due date checks, defaults to datetime.now()
+        """
+        now = now or datetime.now()
         issues = []
         
-        if self.is_overdue:
+        if self._is_overdue(now):
             issues.append(f"Order {self.id} is overdue")
         
-        if self.days_until_due is not None and self.days_until_due <= 1:
-            issues.append(f"Order {self.id} is due soon ({self.days_until_due} days)")
+        days_until_due = self._days_until_due(now)
+        if days_until_due is not None and days_until_due <= 1:
+            issues.append(f"Order {self.id} is due soon ({days_until_due} days)")
         
         if self.total_area > 10_000_000:  # More than 10 m²
             issues.append(f"Order {self.id} has very large area: {self.total_area/1_000_000:.1f} m²")
         
         return issues
     
+    @classmethod
+    def validate_many(cls, orders: List['Order'], now: Optional[datetime] = None) -> List[str]:
+        """Validate several orders against one timestamp and collect their issues"""
+        now = now or datetime.now()
+        issues = []
+        for order in orders:
+            issues.extend(order.validate(now))
+        return issues
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
             "id": self.id,
             "quantity": self.quantity,
-            "priority": self.priority.name,
-            "material_type": self.material_type.value,
+            "priority": self.priority._serialized_name,
+            "material_type": self.material_type._serialized,
             "thickness": self.thickness,
             "tolerance": self.tolerance,
             "customer_id": self.customer_id,
-            "status": self.status.value,
+            "status": self.status._serialized,
             "total_area": self.total_area,
             "total_value": self.total_value,
             "is_urgent": self.is_urgent,
@@ -331,10 +441,10 @@ class Order:
         }
     
     def __str__(self):
-        return f"Order({self.id}: {self.shape} x{self.quantity}, {self.priority.name}, {self.status.value})"
+        return f"Order({self.id}: {self.shape} x{self.quantity}, {self.priority._serialized_name}, {self.status._serialized})"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PlacedShape:
     """Enhanced placed shape with metadata"""
     order_id: str
@@ -345,6 +455,14 @@ class PlacedShape:
     cutting_sequence: int = 0
     estimated_cutting_time: float = 0.0  # minutes
     
+    @classmethod
+    def build(cls, order_id: str, shape: Shape, stock_id: str, now: datetime,
+              rotation: float = 0.0, seq: int = 0, cut_time: float = 0.0) -> 'PlacedShape':
+        """Create a placement stamped with a timestamp the caller reads once
+        per batch; algorithms building many placements use this instead of
+        paying a datetime.now() default per instance"""
+        return cls(order_id, shape, stock_id, now, rotation, seq, cut_time)
+    
     @property
     def position(self) -> Tuple[float, float]:
         """Get position as tuple"""
@@ -352,11 +470,14 @@ class PlacedShape:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
+        # Read the shape once rather than through the position property;
+        # shapes are mutable, so the position is not cached
+        shape = self.shape
         return {
             "order_id": self.order_id,
             "stock_id": self.stock_id,
-            "position": self.position,
-            "area": self.shape.area(),
+            "position": (shape.x, shape.y),
+            "area": shape.area(),
             "rotation_applied": self.rotation_applied,
             "cutting_sequence": self.cutting_sequence,
             "estimated_cutting_time": self.estimated_cutting_time
@@ -366,9 +487,15 @@ class PlacedShape:
         return f"PlacedShape({self.order_id} on {self.stock_id} at {self.shape.x:.1f},{self.shape.y:.1f})"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CuttingResult:
-    """Enhanced cutting optimization results"""
+    """Enhanced cutting optimization results
+    
+    placed_shapes is append-only: add shapes with add_placed, and to change
+    or remove placements assign a new list. Replacing an item in place is
+    not seen by the per-stock index behind total_area_used and
+    get_stock_used_area.
+    """
     total_stock_used: int = 0
     total_orders_fulfilled: int = 0
     total_waste_area: float = 0.0
@@ -382,10 +509,57 @@ class CuttingResult:
     total_cost: float = 0.0
     estimated_cutting_time: float = 0.0  # total cutting time in minutes
     
+    # Running totals and per-stock index over placed_shapes. They catch up
+    # lazily with shapes appended since the last query and are rebuilt when
+    # the list is replaced or shrinks
+    _indexed_shapes: Optional[List[PlacedShape]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _indexed_area: float = field(default=0.0, init=False, repr=False, compare=False)
+    _shapes_by_stock: Dict[str, List[PlacedShape]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _area_by_stock: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def add_placed(self, placed: PlacedShape):
+        """Append a placed shape, keeping the totals and index current"""
+        self.placed_shapes.append(placed)
+        self._sync_index()
+    
+    def add_placed_shapes(self, placed_shapes: List[PlacedShape]):
+        """Append several placed shapes, indexing them in one pass"""
+        self.placed_shapes.extend(placed_shapes)
+        self._sync_index()
+    
+    def _sync_index(self):
+        """Fold placed shapes added since the last query into the index"""
+        shapes = self.placed_shapes
+        if shapes is not self._indexed_shapes or len(shapes) < self._indexed_count:
+            self._indexed_shapes = shapes
+            self._indexed_count = 0
+            self._indexed_area = 0.0
+            self._shapes_by_stock = {}
+            self._area_by_stock = {}
+        
+        if len(shapes) > self._indexed_count:
+            shapes_by_stock = self._shapes_by_stock
+            area_by_stock = self._area_by_stock
+            total = self._indexed_area
+            for placed in shapes[self._indexed_count:]:
+                area = placed.shape.area()
+                total += area
+                stock_id = placed.stock_id
+                if stock_id in shapes_by_stock:
+                    shapes_by_stock[stock_id].append(placed)
+                    area_by_stock[stock_id] += area
+                else:
+                    shapes_by_stock[stock_id] = [placed]
+                    area_by_stock[stock_id] = area
+            self._indexed_area = total
+            self._indexed_count = len(shapes)
+    
     @property
     def total_area_used(self) -> float:
         """Calculate total area of placed shapes"""
-        return sum(ps.shape.area() for ps in self.placed_shapes)
+        self._sync_index()
+        return self._indexed_area
     
     @property
     def waste_percentage(self) -> float:
@@ -409,41 +583,45 @@ class CuttingResult:
     
     def get_shapes_by_stock(self, stock_id: str) -> List[PlacedShape]:
         """Get all shapes placed on a specific stock"""
-        return [ps for ps in self.placed_shapes if ps.stock_id == stock_id]
+        self._sync_index()
+        return list(self._shapes_by_stock.get(stock_id, ()))
+    
+    def get_stock_used_area(self, stock_id: str) -> float:
+        """Total area of the shapes placed on a specific stock"""
+        self._sync_index()
+        return self._area_by_stock.get(stock_id, 0.0)
     
     def get_stock_efficiency(self, stock_id: str, stock_area: float) -> float:
         """Calculate efficiency for a specific stock"""
-        shapes_on_stock = self.get_shapes_by_stock(stock_id)
-        used_area = sum(ps.shape.area() for ps in shapes_on_stock)
+        used_area = self.get_stock_used_area(stock_id)
         return (used_area / stock_area * 100) if stock_area > 0 else 0.0
     
     def get_material_summary(self) -> Dict[MaterialType, Dict[str, Any]]:
         """Get summary by material type"""
-        summary = {}
+        summary = defaultdict(lambda: {
+            "orders_unfulfilled": 0,
+            "area_unfulfilled": 0.0,
+            "orders_fulfilled": 0,
+            "area_fulfilled": 0.0
+        })
         
-        # Group by material type
+        # Group by material type, hashing each material once per order
         for order in self.unfulfilled_orders:
-            mat = order.material_type
-            if mat not in summary:
-                summary[mat] = {
-                    "orders_unfulfilled": 0,
-                    "area_unfulfilled": 0.0,
-                    "orders_fulfilled": 0,
-                    "area_fulfilled": 0.0
-                }
-            summary[mat]["orders_unfulfilled"] += 1
-            summary[mat]["area_unfulfilled"] += order.total_area
-        
-        # Add fulfilled orders (would need order lookup)
-        for placed in self.placed_shapes:
-            # Note: This is simplified - in reality we'd need to lookup the original order
-            pass
+            entry = summary[order.material_type]
+            entry["orders_unfulfilled"] += 1
+            entry["area_unfulfilled"] += order.total_area
         
-        return summary
+        # Fulfilled counts would need the original orders, which placed
+        # shapes do not reference, so they stay at zero
+        return dict(summary)
     
     def export_summary(self, filepath: str):
-        """Export result summary to JSON"""
-        summary = {
+        """Export result summary to JSON
+        
+        Placed shapes are encoded and written one per line as they are read,
+        so no list holding every shape's dict is built first.
+        """
+        header = {
             "optimization_date": self.optimization_date.isoformat(),
             "algorithm_used": self.algorithm_used,
             "computation_time": self.computation_time,
@@ -455,13 +633,31 @@ class CuttingResult:
             "fulfillment_rate": self.fulfillment_rate,
             "total_cost": self.total_cost,
             "cost_per_area": self.cost_per_area,
-            "estimated_cutting_time": self.estimated_cutting_time,
-            "placed_shapes": [ps.to_dict() for ps in self.placed_shapes],
-            "metadata": self.metadata
+            "estimated_cutting_time": self.estimated_cutting_time
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(summary, f, indent=2)
+        # Written to a temporary file beside the target and moved into place
+        # once complete, so a failed export leaves no truncated file behind
+        temp_path = f"{filepath}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(b'{')
+                for key, value in header.items():
+                    f.write(b'\n  ' + _json_bytes(key) + b': ' + _json_bytes(value) + b',')
+                f.write(b'\n  "placed_shapes": [')
+                separator = b'\n    '
+                for ps in self.placed_shapes:
+                    f.write(separator)
+                    f.write(_json_bytes(ps.to_dict()))
+                    separator = b',\n    '
+                f.write(b'\n  ],\n  "metadata": ')
+                f.write(_json_bytes(self.metadata))
+                f.write(b'\n}\n')
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
     
     def __str__(self):
         return (f"CuttingResult(Stocks: {self.total_stock_used}, "
@@ -469,7 +665,7 @@ class CuttingResult:
                 f"Efficiency: {self.efficiency_percentage:.1f}%)")
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OptimizationConfig:
     """Enhanced configuration for optimization algorithms"""
     allow_rotation: bool = True
@@ -485,6 +681,7 @@ class OptimizationConfig:
     group_by_thickness: bool = True  # Group orders by thickness
     group_by_material: bool = True  # Group orders by material
     allow_partial_fulfillment: bool = True  # Allow partial order fulfillment
+    sort_pieces: bool = True  # Place larger pieces first (decreasing area)
     
     # Quality settings
     placement_precision: float = 0.1  # mm precision for placement
@@ -531,13 +728,14 @@ class OptimizationConfig:
             "minimize_cuts": self.minimize_cuts,
             "group_by_thickness": self.group_by_thickness,
             "group_by_material": self.group_by_material,
+            "sort_pieces": self.sort_pieces,
             "placement_precision": self.placement_precision,
             "optimize_for_cost": self.optimize_for_cost,
             "optimize_for_time": self.optimize_for_time
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Surface:
     """Simple surface representation for cutting optimization"""
     width: float
@@ -556,7 +754,7 @@ class Surface:
         return f"Surface({self.width}x{self.height})"
 
 
-@dataclass  
+@dataclass(**_SLOTS)
 class Piece:
     """Simple piece representation for cutting optimization"""
     width: float
@@ -576,7 +774,7 @@ class Piece:
         return f"Piece({self.width}x{self.height}, id={self.piece_id})"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CuttingPattern:
     """Cutting pattern for column generation algorithms"""
     surface_id: int
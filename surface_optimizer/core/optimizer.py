@@ -4,6 +4,7 @@ Enhanced with logging and advanced features
 """
 
 import time
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from .models import Stock, Order, CuttingResult, OptimizationConfig
 from .validators import validate_stocks, validate_orders, validate_stock_order_compatibility
@@ -55,14 +56,9 @@ class Optimizer:
             
             # Validate inputs
             try:
-                stock_issues = []
-                order_issues = []
-                
-                for stock in stocks:
-                    stock_issues.extend(stock.validate())
-                
-                for order in orders:
-                    order_issues.extend(order.validate())
+                now = datetime.now()
+                stock_issues = Stock.validate_many(stocks, now)
+                order_issues = Order.validate_many(orders, now)
                 
                 self.logger.log_validation("stocks", len(stocks), stock_issues)
                 self.logger.log_validation("orders", len(orders), order_issues)
@@ -0,0 +1,126 @@
+"""
+Structure-of-arrays view of many shapes for bulk geometry queries
+"""
+
+from typing import List
+
+import numpy as np
+
+from .geometry import Shape, Rectangle, Circle
+from ._geom_cuda import rect_overlap_pairs_gpu
+
+# Default column dtype. float64 keeps the bulk queries in exact agreement
+# with Shape.overlaps. Passing dtype=np.float32 to from_list halves memory
+# traffic and doubles the SIMD width, and is ample for millimetre layouts,
+# but then results can differ from Shape.overlaps by float32 rounding of
+# the inputs, e.g. for shapes that only just touch
+GEOM_DTYPE = np.float64
+
+
+def aabb_overlap_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise bounding-box overlap of boxes a (N, 4) and b (M, 4), each
+    row (min_x, min_y, max_x, max_y); returns an (N, M) mask, touching counts"""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return ~((a[:, None, 2] < b[None, :, 0]) | (b[None, :, 2] < a[:, None, 0]) | 
+             (a[:, None, 3] < b[None, :, 1]) | (b[None, :, 3] < a[:, None, 1]))
+
+
+class ShapeArray:
+    """Parallel NumPy columns (center, size, rotation cos/sin, kind) for a
+    list of shapes, so bounding boxes and overlap tests run over whole
+    columns instead of one Python object at a time"""
+    
+    RECTANGLE = 0
+    CIRCLE = 1
+    OTHER = 2  # Polygons and other shapes, stored by bounding box
+    
+    def __init__(self, shapes: List[Shape], cx: np.ndarray, cy: np.ndarray, 
+                 w: np.ndarray, h: np.ndarray, cos: np.ndarray, sin: np.ndarray, kind: np.ndarray):
+        self.shapes = shapes
+        self.cx = cx
+        self.cy = cy
+        self.w = w
+        self.h = h
+        self.cos = cos
+        self.sin = sin
+        self.kind = kind
+    
+    @classmethod
+    def from_shapes(cls, shapes: List[Shape], dtype=None) -> 'ShapeArray':
+        """Build the columns from shape objects, stored as dtype (GEOM_DTYPE by default)"""
+        dtype = GEOM_DTYPE if dtype is None else dtype
+        shapes = list(shapes)
+        rows = np.empty((len(shapes), 6))
+        kind = np.empty(len(shapes), dtype=np.int8)
+        
+        for i, shape in enumerate(shapes):
+            if isinstance(shape, Rectangle):
+                rows[i] = (shape.x + shape.width / 2, shape.y + shape.height / 2, 
+                           shape.width, shape.height) + shape._rotation_trig()
+                kind[i] = cls.RECTANGLE
+            elif isinstance(shape, Circle):
+                rows[i] = (shape.x, shape.y, 2 * shape.radius, 2 * shape.radius, 1, 0)
+                kind[i] = cls.CIRCLE
+            else:
+                min_x, min_y, max_x, max_y = shape.bounding_box()
+                rows[i] = ((min_x + max_x) / 2, (min_y + max_y) / 2, 
+                           max_x - min_x, max_y - min_y, 1, 0)
+                kind[i] = cls.OTHER
+        
+        cx, cy, w, h, cos, sin = rows.astype(dtype).T
+        return cls(shapes, cx.copy(), cy.copy(), w.copy(), h.copy(), cos.copy(), sin.copy(), kind)
+    
+    def __len__(self) -> int:
+        return len(self.shapes)
+    
+    def aabb(self):
+        """Bounding boxes as (min_x, min_y, max_x, max_y) arrays
+        
+        A rotated w x h box projects onto the x and y axes with half
+        extents (w|cos| + h|sin|) / 2 and (w|sin| + h|cos|) / 2.
+        """
+        abs_cos = np.abs(self.cos)
+        abs_sin = np.abs(self.sin)
+        half_x = 0.5 * (self.w * abs_cos + self.h * abs_sin)
+        half_y = 0.5 * (self.w * abs_sin + self.h * abs_cos)
+        return self.cx - half_x, self.cy - half_y, self.cx + half_x, self.cy + half_y
+    
+    def aabb_pairs(self) -> np.ndarray:
+        """(N, N) mask of shape pairs whose bounding boxes meet, in one
+        broadcast instead of N * N overlap calls; the diagonal is True"""
+        boxes = np.column_stack(self.aabb())
+        return aabb_overlap_matrix(boxes, boxes)
+    
+    def aabb_overlap_mask(self, i: int) -> np.ndarray:
+        """Shapes whose bounding box meets shape i's (touching counts)"""
+        min_x, min_y, max_x, max_y = self.aabb()
+        return ~((max_x < min_x[i]) | (max_x[i] < min_x) | 
+                 (max_y < min_y[i]) | (max_y[i] < min_y))
+    
+    def overlap_mask(self, i: int, js) -> np.ndarray:
+        """Whether shape i overlaps each shape in js, matching Shape.overlaps"""
+        js = np.asarray(js, dtype=np.int64)
+        return self.overlap_pairs(np.full(len(js), i, dtype=np.int64), js)
+    
+    def overlap_pairs(self, idx_a, idx_b) -> np.ndarray:
+        """Whether shape idx_a[k] overlaps shape idx_b[k], matching Shape.overlaps
+        
+        Rectangle pairs go through the compiled SAT kernel, on the GPU for
+        large batches when CUDA is available; pairs involving other shapes
+        fall back to their own overlap methods. Pass every pair of an
+        iteration in one call so the columns are copied to the GPU once.
+        """
+        idx_a = np.asarray(idx_a, dtype=np.int64)
+        idx_b = np.asarray(idx_b, dtype=np.int64)
+        mask = np.empty(len(idx_a), dtype=bool)
+        
+        rect_pairs = (self.kind[idx_a] == self.RECTANGLE) & (self.kind[idx_b] == self.RECTANGLE)
+        if rect_pairs.any():
+            mask[rect_pairs] = rect_overlap_pairs_gpu(
+                self.cx, self.cy, self.cos, self.sin, self.w / 2, self.h / 2,
+                idx_a[rect_pairs], idx_b[rect_pairs])
+        
+        for k in np.flatnonzero(~rect_pairs):
+            mask[k] = self.shapes[idx_a[k]].overlaps(self.shapes[idx_b[k]])
+        return mask
@@ -0,0 +1,164 @@
+"""
+Structure-of-arrays view of many stocks for bulk candidate selection
+"""
+
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from .models import Stock, Order, MaterialType, StockStatus
+from .geometry import Shape, Rectangle, Circle
+from ._geom_numba import NUMBA_AVAILABLE, match_orders_to_stocks
+
+# Small integer codes so material and status compare as int8 columns
+MATERIAL_CODES = {material: code for code, material in enumerate(MaterialType)}
+STATUS_CODES = {status: code for code, status in enumerate(StockStatus)}
+
+
+def _fit_size(shape: Shape) -> Tuple[float, float]:
+    """Width and height a stock needs to take the shape; shapes without a
+    stock fit test need an infinite sheet, so they never fit"""
+    if isinstance(shape, Rectangle):
+        if shape._is_axis_aligned:
+            return shape.width, shape.height
+        min_x, min_y, max_x, max_y = shape.bounding_box()
+        return max_x - min_x, max_y - min_y
+    if isinstance(shape, Circle):
+        return 2 * shape.radius, 2 * shape.radius
+    return np.inf, np.inf
+
+
+class StockTable:
+    """Parallel NumPy columns (size, thickness, material, status) for a list
+    of stocks, so "which stocks can take this order" is a handful of column
+    comparisons instead of a can_be_fulfilled_by_stock call per stock"""
+    
+    def __init__(self, stocks: List[Stock], width: np.ndarray, height: np.ndarray,
+                 thickness: np.ndarray, material_type: np.ndarray, status: np.ndarray):
+        self.stocks = stocks
+        self.ids = [stock.id for stock in stocks]
+        self.width = width
+        self.height = height
+        self.thickness = thickness
+        self.material_type = material_type
+        self.status = status
+        
+        # Masks built once and kept current by reserve/release, so batch
+        # filters are bitwise ANDs; they are read-only to callers
+        self.material_masks: Dict[MaterialType, np.ndarray] = {}
+        for material, code in MATERIAL_CODES.items():
+            mask = material_type == code
+            mask.flags.writeable = False
+            self.material_masks[material] = mask
+        self.available_mask = status == STATUS_CODES[StockStatus.AVAILABLE]
+        # Callers get a read-only view that still follows reserve/release
+        self._available_view = self.available_mask.view()
+        self._available_view.flags.writeable = False
+    
+    @classmethod
+    def from_list(cls, stocks: List[Stock]) -> 'StockTable':
+        """Build the columns from stock objects"""
+        stocks = list(stocks)
+        sizes = np.array([(stock.width, stock.height, stock.thickness) for stock in stocks],
+                         dtype=np.float64).reshape(-1, 3)
+        material_type = np.array([MATERIAL_CODES[stock.material_type] for stock in stocks],
+                                 dtype=np.int8)
+        status = np.array([STATUS_CODES[stock.status] for stock in stocks], dtype=np.int8)
+        width, height, thickness = sizes.T
+        return cls(stocks, width.copy(), height.copy(), thickness.copy(), material_type, status)
+    
+    def __len__(self) -> int:
+        return len(self.stocks)
+    
+    @property
+    def area(self) -> np.ndarray:
+        """Stock areas in mm²"""
+        return self.width * self.height
+    
+    def fits_rectangle(self, width: float, height: float) -> np.ndarray:
+        """Mask of stocks at least width x height (edges may coincide)"""
+        return (self.width >= width) & (self.height >= height)
+    
+    def fits_shape(self, shape: Shape) -> np.ndarray:
+        """Vectorized Stock.can_fit_shape"""
+        return self.fits_rectangle(*_fit_size(shape))
+    
+    def with_material(self, material_type: MaterialType) -> np.ndarray:
+        """Mask of stocks of the given material"""
+        return self.material_masks[material_type]
+    
+    def available(self) -> np.ndarray:
+        """Mask of stocks whose status is AVAILABLE (read-only)"""
+        return self._available_view
+    
+    def reserve(self, index: int) -> bool:
+        """Stock.reserve on the stock at index, keeping the status columns current"""
+        reserved = self.stocks[index].reserve()
+        if reserved:
+            self._sync_status(index)
+        return reserved
+    
+    def release(self, index: int) -> bool:
+        """Stock.release on the stock at index, keeping the status columns current"""
+        released = self.stocks[index].release()
+        if released:
+            self._sync_status(index)
+        return released
+    
+    def refresh_status(self):
+        """Re-read every stock's status after changes made outside the table"""
+        for index in range(len(self.stocks)):
+            self._sync_status(index)
+    
+    def _sync_status(self, index: int):
+        status = self.stocks[index].status
+        self.status[index] = STATUS_CODES[status]
+        self.available_mask[index] = status is StockStatus.AVAILABLE
+    
+    def matches_order(self, order: Order, available_only: bool = False) -> np.ndarray:
+        """Vectorized Order.can_be_fulfilled_by_stock over every stock,
+        optionally restricted to available stocks"""
+        mask = (self.with_material(order.material_type) &
+                (np.abs(self.thickness - order.thickness) <= order.tolerance) &
+                self.fits_shape(order.shape))
+        if available_only:
+            mask &= self.available()
+        return mask
+    
+    def match_matrix(self, orders: List[Order], available_only: bool = False) -> np.ndarray:
+        """matches_order for many orders at once: an (orders, stocks) mask
+        
+        Order columns are built once; the numba kernel then fills the mask
+        row by row across cores, while without numba the columns are
+        broadcast against the stock columns.
+        """
+        orders = list(orders)
+        material = np.array([MATERIAL_CODES[order.material_type] for order in orders],
+                            dtype=np.int8)
+        rows = np.array([(order.thickness, order.tolerance) + tuple(_fit_size(order.shape))
+                         for order in orders], dtype=np.float64).reshape(-1, 4)
+        thickness, tolerance, need_width, need_height = (column.copy() for column in rows.T)
+        
+        if NUMBA_AVAILABLE:
+            mask = np.empty((len(orders), len(self)), dtype=np.bool_)
+            match_orders_to_stocks(material, thickness, tolerance, need_width, need_height,
+                                   self.material_type, self.thickness, self.width, self.height,
+                                   mask)
+        else:
+            # Material is the cheapest and most selective test, so it goes first
+            mask = material[:, None] == self.material_type[None, :]
+            mask &= np.abs(self.thickness[None, :] - thickness[:, None]) <= tolerance[:, None]
+            mask &= ((self.width[None, :] >= need_width[:, None]) & 
+                     (self.height[None, :] >= need_height[:, None]))
+        
+        if available_only:
+            mask &= self.available()[None, :]
+        return mask
+    
+    def select(self, mask: np.ndarray) -> List[Stock]:
+        """Stock objects where mask is set, in table order"""
+        return [self.stocks[i] for i in np.flatnonzero(mask)]
+    
+    def candidates_for(self, order: Order, available_only: bool = False) -> List[Stock]:
+        """Stocks that can fulfil the order, for the per-object placement step"""
+        return self.select(self.matches_order(order, available_only))
@@ -4,6 +4,7 @@ Validation utilities for Surface Cutting Optimizer
 
 from typing import List
 from .models import Stock, Order
+from .stock_table import StockTable
 from .exceptions import ValidationError
 
 
@@ -39,16 +40,11 @@ def validate_orders(orders: List[Order]) -> bool:
 
 def validate_stock_order_compatibility(stocks: List[Stock], orders: List[Order]) -> bool:
     """Check if orders can potentially be fulfilled by stocks"""
-    material_stocks = {}
+    stock_table = StockTable.from_list(stocks)
+    stock_areas = stock_table.area
     material_orders = {}
     
-    # Group by material type
-    for stock in stocks:
-        material_type = stock.material_type
-        if material_type not in material_stocks:
-            material_stocks[material_type] = []
-        material_stocks[material_type].append(stock)
-    
+    # Group orders by material type; stocks are matched by column mask
     for order in orders:
         material_type = order.material_type
         if material_type not in material_orders:
@@ -57,11 +53,11 @@ def validate_stock_order_compatibility(stocks: List[Stock], orders: List[Order])
     
     # Check each material type
     for material_type, orders_list in material_orders.items():
-        if material_type not in material_stocks:
+        material_mask = stock_table.with_material(material_type)
+        if not material_mask.any():
             raise ValidationError(f"No stocks available for material type: {material_type}")
         
-        stocks_list = material_stocks[material_type]
-        total_stock_area = sum(stock.area for stock in stocks_list)
+        total_stock_area = float(stock_areas[material_mask].sum())
         total_order_area = sum(order.total_area for order in orders_list)
         
         if total_order_area > total_stock_area:
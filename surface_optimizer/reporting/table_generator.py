@@ -175,7 +175,7 @@ class StockUtilizationTable:
             for stock in stocks:
                 shapes_on_stock = stock_usage.get(stock.id, [])
                 
-                total_used_area = sum(ps.shape.area() for ps in shapes_on_stock)
+                total_used_area = result.get_stock_used_area(stock.id)
                 efficiency = (total_used_area / stock.area * 100) if stock.area > 0 else 0
                 waste_area = stock.area - total_used_area
                 waste_percentage = 100 - efficiency
@@ -452,7 +452,7 @@ class CostAnalysisTable:
         
         for stock in stocks:
             shapes_on_stock = stock_usage.get(stock.id, [])
-            used_area = sum(ps.shape.area() for ps in shapes_on_stock)
+            used_area = result.get_stock_used_area(stock.id)
             efficiency = (used_area / stock.area * 100) if stock.area > 0 else 0
             
             cost_per_piece = stock.total_cost / len(shapes_on_stock) if shapes_on_stock else 0
@@ -540,7 +540,7 @@ class CostAnalysisTable:
         used_stocks = {ps.stock_id for ps in result.placed_shapes}
         total_stock_cost = sum(stock.total_cost for stock in stocks if stock.id in used_stocks)
         total_stock_area = sum(stock.area for stock in stocks if stock.id in used_stocks)
-        total_used_area = sum(ps.shape.area() for ps in result.placed_shapes)
+        total_used_area = result.total_area_used
         
         data = [{
             'Metric': 'Total Stocks Used',
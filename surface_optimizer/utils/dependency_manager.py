@@ -10,6 +10,7 @@ Automatically detects, installs and manages free optimization libraries:
 Provides intelligent fallbacks when libraries are not available.
 """
 
+import copy
 import subprocess
 import sys
 import importlib
@@ -419,8 +420,20 @@ def ensure_solver_available(problem_complexity: str = "medium") -> bool:
     return True
 
 
+# Last report from get_solver_status and the availability flags it was built from
+_solver_status_cache: Dict[str, any] = {'key': None, 'status': None}
+
+
 def get_solver_status() -> Dict[str, any]:
-    """Get current solver status for reporting"""
+    """Get current solver status for reporting
+    
+    The report is rebuilt only when a solver's availability has changed
+    (e.g. after an install); each caller gets its own copy of it.
+    """
+    key = tuple(solver_info.is_available for solver_info in dependency_manager.solvers.values())
+    if _solver_status_cache['key'] == key:
+        return copy.deepcopy(_solver_status_cache['status'])
+    
     available_solvers = []
     missing_solvers = []
     
@@ -437,9 +450,11 @@ def get_solver_status() -> Dict[str, any]:
                 "install_command": solver_info.install_command
             })
     
-    return {
+    status = {
         "available_solvers": available_solvers,
         "missing_solvers": missing_solvers,
         "total_available": len(available_solvers),
         "recommendations": dependency_manager.get_solver_recommendations()
-    } 
\ No newline at end of file
+    }
+    _solver_status_cache.update(key=key, status=status)
+    return copy.deepcopy(status)
@@ -12,7 +12,7 @@ def calculate_efficiency(result: CuttingResult, stocks: List[Stock]) -> float:
         return 0.0
     
     used_stock_ids = set(ps.stock_id for ps in result.placed_shapes)
-    total_placed_area = sum(ps.shape.area() for ps in result.placed_shapes)
+    total_placed_area = result.total_area_used
     total_stock_area = sum(stock.area for stock in stocks if stock.id in used_stock_ids)
     
     return (total_placed_area / total_stock_area) * 100 if total_stock_area > 0 else 0.0
@@ -24,7 +24,7 @@ def calculate_waste(result: CuttingResult, stocks: List[Stock]) -> float:
         return 0.0
     
     used_stock_ids = set(ps.stock_id for ps in result.placed_shapes)
-    total_placed_area = sum(ps.shape.area() for ps in result.placed_shapes)
+    total_placed_area = result.total_area_used
     total_stock_area = sum(stock.area for stock in stocks if stock.id in used_stock_ids)
     
     return total_stock_area - total_placed_area
@@ -36,7 +36,7 @@ def generate_metrics_report(result: CuttingResult, stocks: List[Stock], orders:
     used_stock_ids = set(ps.stock_id for ps in result.placed_shapes)
     
     # Basic metrics
-    total_placed_area = sum(ps.shape.area() for ps in result.placed_shapes)
+    total_placed_area = result.total_area_used
     total_stock_area = sum(stock.area for stock in stocks if stock.id in used_stock_ids)
     total_order_area = sum(order.total_area for order in orders)
     
@@ -234,8 +234,7 @@ def plot_waste_analysis(result: CuttingResult, stocks: List[Stock],
         # Calculate waste for each stock
         stock_data = []
         for stock in used_stocks:
-            stock_shapes = [ps for ps in result.placed_shapes if ps.stock_id == stock.id]
-            used_area = sum(ps.shape.area() for ps in stock_shapes)
+            used_area = result.get_stock_used_area(stock.id)
             waste_area = stock.area - used_area
             waste_percentage = (waste_area / stock.area) * 100
             
@@ -4,11 +4,17 @@ Unit tests for optimization algorithms
 """
 
 import unittest
+import random
+import numpy as np
 from surface_optimizer.core.models import Stock, Order, OptimizationConfig, MaterialType, Priority
-from surface_optimizer.core.geometry import Rectangle, Circle
-from surface_optimizer.algorithms.basic.bottom_left import BottomLeftAlgorithm
+from surface_optimizer.core.geometry import Rectangle
+from surface_optimizer.algorithms.basic.bottom_left import BottomLeftAlgorithm, find_bl_position
 from surface_optimizer.algorithms.basic.best_fit import BestFitAlgorithm
 from surface_optimizer.algorithms.basic.first_fit import FirstFitAlgorithm
+try:
+    from surface_optimizer.algorithms.advanced.simulated_annealing import SimulatedAnnealingAlgorithm
+except ImportError:  # The advanced package also imports the genetic algorithm
+    SimulatedAnnealingAlgorithm = None
 from surface_optimizer.utils.test_cases import (
     get_all_test_cases, 
     validate_result_against_optimal,
@@ -68,6 +74,32 @@ class TestBottomLeftAlgorithm(unittest.TestCase):
         self.assertIsInstance(result.computation_time, float)
         self.assertEqual(result.algorithm_used, "Bottom-Left Fill")
     
+    def test_adjacent_placement(self):
+        """Test pieces may touch edges and pack into a single stock"""
+        stocks = [Stock("S1", 200, 100, 6.0, MaterialType.GLASS, 100.0),
+                  Stock("S2", 200, 100, 6.0, MaterialType.GLASS, 100.0)]
+        orders = [Order("O1", Rectangle(100, 100), 2, Priority.HIGH)]
+        
+        result = self.algorithm.optimize(stocks, orders, self.config)
+        
+        self.assertEqual(result.total_stock_used, 1)
+        positions = sorted((ps.shape.x, ps.shape.y) for ps in result.placed_shapes)
+        self.assertEqual(positions, [(0, 0), (100, 0)])
+    
+    def test_placement_kernel(self):
+        """Test the scalar placement kernel finds corners and rotations"""
+        occupied = (np.array([0.0, 100.0]), np.array([0.0, 100.0]),
+                    np.array([0.0]), np.array([0.0]), np.array([100.0]), np.array([100.0]))
+        
+        # Beside the occupied block, touching its right edge
+        self.assertEqual(find_bl_position(200.0, 100.0, 100.0, 100.0, *occupied, False),
+                         (100.0, 0.0, False))
+        
+        # Only fits next to the block when turned
+        self.assertEqual(find_bl_position(150.0, 100.0, 100.0, 50.0, *occupied, True),
+                         (100.0, 0.0, True))
+        self.assertLess(find_bl_position(150.0, 100.0, 100.0, 50.0, *occupied, False)[0], 0)
+    
     def test_order_preprocessing(self):
         """Test order preprocessing (sorting by priority)"""
         orders = [
@@ -84,6 +116,156 @@ class TestBottomLeftAlgorithm(unittest.TestCase):
         self.assertEqual(priorities, sorted(priorities, reverse=True))
 
 
+class TestFirstFitAlgorithm(unittest.TestCase):
+    """Test cases for First Fit Decreasing algorithm"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.algorithm = FirstFitAlgorithm()
+    
+    def _boxes(self, result):
+        """Placed footprints as (stock_id, min_x, min_y, max_x, max_y)"""
+        return [(ps.stock_id,) + ps.shape.bounding_box() for ps in result.placed_shapes]
+    
+    def test_no_overlaps_within_stock(self):
+        """Test placed pieces stay inside their stock and never overlap"""
+        rng = random.Random(7)
+        stocks = [Stock(f"S{i}", 1000, 600, 6.0) for i in range(3)]
+        orders = [Order(f"O{i}", Rectangle(rng.randint(50, 400), rng.randint(50, 300)), 
+                        rng.randint(1, 3)) for i in range(20)]
+        config = OptimizationConfig(allow_rotation=True)
+        
+        result = self.algorithm.optimize(stocks, orders, config)
+        boxes = self._boxes(result)
+        
+        self.assertGreater(len(boxes), 0)
+        self.assertEqual(len(boxes) + len(result.unfulfilled_orders), 
+                         sum(order.quantity for order in orders))
+        for stock_id, min_x, min_y, max_x, max_y in boxes:
+            self.assertGreaterEqual(min_x, 0)
+            self.assertGreaterEqual(min_y, 0)
+            self.assertLessEqual(max_x, 1000)
+            self.assertLessEqual(max_y, 600)
+        
+        # Touching edges are allowed, interiors must be disjoint
+        for i, (stock_a, ax0, ay0, ax1, ay1) in enumerate(boxes):
+            for stock_b, bx0, by0, bx1, by1 in boxes[i + 1:]:
+                if stock_a == stock_b:
+                    self.assertFalse(ax0 < bx1 and bx0 < ax1 and ay0 < by1 and by0 < ay1)
+    
+    def test_decreasing_order(self):
+        """Test larger pieces are placed first, so a late large piece still fits"""
+        stocks = [Stock("S1", 100, 100, 6.0)]
+        orders = [Order("Small", Rectangle(30, 30), 1), Order("Large", Rectangle(100, 70), 1)]
+        config = OptimizationConfig(allow_rotation=False)
+        
+        result = self.algorithm.optimize(stocks, orders, config)
+        
+        positions = {ps.order_id: (ps.shape.x, ps.shape.y) for ps in result.placed_shapes}
+        self.assertEqual(positions, {"Large_1": (0, 0), "Small_1": (0, 70)})
+        self.assertEqual(result.unfulfilled_orders, [])
+        self.assertEqual(result.total_orders_fulfilled, 2)
+    
+    def test_input_order_without_sorting(self):
+        """Test sort_pieces=False keeps input order, so the small piece blocks the large one"""
+        stocks = [Stock("S1", 100, 100, 6.0)]
+        orders = [Order("Small", Rectangle(30, 30), 1), Order("Large", Rectangle(100, 70), 1)]
+        config = OptimizationConfig(allow_rotation=False, sort_pieces=False)
+        
+        result = self.algorithm.optimize(stocks, orders, config)
+        
+        self.assertEqual([(ps.order_id, ps.shape.x, ps.shape.y) for ps in result.placed_shapes], 
+                         [("Small_1", 0, 0)])
+        self.assertEqual([order.id for order in result.unfulfilled_orders], ["Large_1"])
+
+
+@unittest.skipIf(SimulatedAnnealingAlgorithm is None, "advanced algorithms are not importable")
+class TestSimulatedAnnealingMoves(unittest.TestCase):
+    """Test cases for simulated annealing neighborhood moves"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.algorithm = SimulatedAnnealingAlgorithm(seed=1)
+        self.config = OptimizationConfig(allow_rotation=True)
+    
+    def _initial_solution(self, stocks, orders):
+        """Initial greedy solution with the per-run indexes optimize() builds"""
+        expanded = self.algorithm._expand_orders(orders)
+        self.algorithm._stocks_by_material.clear()
+        for stock_idx, stock in enumerate(stocks):
+            self.algorithm._stocks_by_material[stock.material_type].append(stock_idx)
+        self.algorithm._is_rect_order = [isinstance(order.shape, Rectangle) for order in expanded]
+        return expanded, self.algorithm._generate_initial_solution(stocks, expanded, self.config)
+    
+    def test_rotate_rejected_on_tight_stock(self):
+        """Test a rotation that would leave the stock keeps placement and footprint unchanged"""
+        stocks = [Stock("S1", 1000, 400, 6.0)]
+        orders = [Order("O1", Rectangle(600, 100), 1)]
+        expanded, solution = self._initial_solution(stocks, orders)
+        placements = list(solution["placements"])
+        usage = solution["stock_usage"][0].copy()
+        
+        self.algorithm._rotate_order(solution, stocks, expanded, self.config, [0.0, 0.0])
+        
+        self.assertEqual(solution["placements"], placements)
+        np.testing.assert_array_equal(solution["stock_usage"][0], usage)
+    
+    def test_rotate_updates_footprint(self):
+        """Test an accepted rotation rewrites the footprint row to the turned size"""
+        stocks = [Stock("S1", 1000, 1000, 6.0)]
+        orders = [Order("O1", Rectangle(600, 100), 1)]
+        expanded, solution = self._initial_solution(stocks, orders)
+        
+        self.algorithm._rotate_order(solution, stocks, expanded, self.config, [0.0, 0.0])
+        
+        order_idx, stock_idx, x, y, rotation, row_idx = solution["placements"][0]
+        self.assertEqual(rotation, 90)
+        self.assertEqual(solution["stock_usage"][stock_idx][row_idx].tolist(), [x, y, 100, 600, 90])
+
+    
+    def assertConsistent(self, solution, stocks, expanded):
+        """Every placement owns a footprint row matching it, inside its stock"""
+        for placement_idx, (order_idx, stock_idx, x, y, rotation, row_idx) in enumerate(
+                solution["placements"]):
+            footprint = self.algorithm._footprint(expanded[order_idx].shape, x, y, rotation)
+            self.assertEqual(solution["row_owners"][stock_idx][row_idx], placement_idx)
+            self.assertEqual(solution["stock_usage"][stock_idx][row_idx].tolist(), footprint)
+            self.assertLessEqual(x + footprint[2], stocks[stock_idx].width)
+            self.assertLessEqual(y + footprint[3], stocks[stock_idx].height)
+        for stock_idx, owners in solution["row_owners"].items():
+            self.assertEqual(len(owners), len(solution["stock_usage"][stock_idx]))
+    
+    def test_neighbors_leave_parent_untouched(self):
+        """Test neighbor moves edit their own copies, never the solution they came from"""
+        rng = random.Random(3)
+        stocks = [Stock(f"S{i}", 400, 300, 6.0) for i in range(3)]
+        orders = [Order(f"O{i}", Rectangle(rng.randint(40, 200), rng.randint(30, 150)), 2)
+                  for i in range(8)]
+        expanded, solution = self._initial_solution(stocks, orders)
+        
+        draws = np.random.default_rng(5)
+        for _ in range(300):
+            placements = list(solution["placements"])
+            usage = {i: rows.copy() for i, rows in solution["stock_usage"].items()}
+            owners = {i: list(rows) for i, rows in solution["row_owners"].items()}
+            rect_placements = list(solution["rect_placements"])
+            
+            neighbor = self.algorithm._generate_neighbor(
+                solution, stocks, expanded, self.config,
+                int(draws.integers(len(SimulatedAnnealingAlgorithm.MOVE_TYPES))), draws.random(2).tolist())
+            
+            self.assertEqual(solution["placements"], placements)
+            for stock_idx in usage:
+                np.testing.assert_array_equal(solution["stock_usage"][stock_idx], usage[stock_idx])
+                self.assertEqual(solution["row_owners"][stock_idx], owners[stock_idx])
+            self.assertEqual(solution["rect_placements"], rect_placements)
+            self.assertConsistent(neighbor, stocks, expanded)
+            
+            # Walk on from the neighbor half the time, like accepted moves
+            if draws.random() < 0.5:
+                solution = neighbor
+
+
 class TestAlgorithmComparison(unittest.TestCase):
     """Test comparison between different algorithms"""
     
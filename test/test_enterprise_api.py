@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the enterprise API job handling
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+try:
+    from fastapi.testclient import TestClient
+    from surface_optimizer.api import enterprise_api
+except ImportError:  # FastAPI, or an optimizer the API imports, is missing
+    enterprise_api = None
+
+
+@unittest.skipIf(enterprise_api is None, "enterprise API is not importable (needs FastAPI)")
+class TestJobCancellation(unittest.TestCase):
+    """Test that a cancelled job keeps its status once the solve returns"""
+    
+    REQUEST = {"surface": {"width": 1000, "height": 500},
+               "pieces": [{"width": 100, "height": 50, "quantity": 2}]}
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = TestClient(enterprise_api.app)
+        self.client.__enter__()  # Runs the startup handlers
+        self.addCleanup(self.client.__exit__, None, None, None)
+        
+        # Solve in a thread so the stand-in solvers below are the ones called
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        patcher = mock.patch.object(enterprise_api, "optimization_executor", executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def submit(self, job_id, solve):
+        """Run one job through POST /optimize with solve standing in for the solver"""
+        with mock.patch.object(enterprise_api, "_optimize_request", solve):
+            response = self.client.post("/optimize", json=dict(self.REQUEST, job_id=job_id))
+        self.assertEqual(response.status_code, 200)
+        return enterprise_api.job_storage.get_job(job_id)
+    
+    def listed_status(self, job_id):
+        """Status of a job as reported by GET /jobs"""
+        jobs = self.client.get("/jobs").json()
+        return next(job['status'] for job in jobs if job['job_id'] == job_id)
+    
+    def cancel_during_solve(self, request):
+        """Stands in for a DELETE arriving while the worker is solving"""
+        response = self.client.delete(f"/jobs/{request.job_id}")
+        self.assertEqual(response.status_code, 200)
+    
+    def test_cancel_during_solve_sticks(self):
+        """Test a job cancelled mid-solve is not overwritten with the solve's result"""
+        def solve(request):
+            self.cancel_during_solve(request)
+            return {'computation_time': 0.1, 'efficiency': 90.0}
+        
+        job = self.submit("cancel-during-solve", solve)
+        
+        self.assertEqual(job['status'], enterprise_api.OptimizationStatus.CANCELLED)
+        self.assertIsNone(job['result'])
+        self.assertEqual(self.listed_status("cancel-during-solve"), "cancelled")
+    
+    def test_cancel_during_failing_solve_sticks(self):
+        """Test a job cancelled mid-solve is not marked failed when the solve raises"""
+        def solve(request):
+            self.cancel_during_solve(request)
+            raise RuntimeError("solver crashed")
+        
+        job = self.submit("cancel-during-failure", solve)
+        
+        self.assertEqual(job['status'], enterprise_api.OptimizationStatus.CANCELLED)
+        self.assertIsNone(job['error'])
+    
+    def test_completed_job_cannot_be_cancelled(self):
+        """Test DELETE on a finished job is refused and leaves its result"""
+        job = self.submit("completed", lambda request: {'computation_time': 0.1, 'efficiency': 90.0})
+        self.assertEqual(job['status'], enterprise_api.OptimizationStatus.COMPLETED)
+        
+        response = self.client.delete("/jobs/completed")
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.listed_status("completed"), "completed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,18 @@ Unit tests for geometry classes
 """
 
 import unittest
+import copy
 import math
+import pickle
+import random
+import subprocess
+import sys
+from unittest import mock
+import numpy as np
 from surface_optimizer.core.geometry import Rectangle, Circle, Polygon
+from surface_optimizer.core.shape_array import ShapeArray, aabb_overlap_matrix
+from surface_optimizer.core.models import Stock, Order, MaterialType
+from surface_optimizer.core.stock_table import StockTable
 from surface_optimizer.core.exceptions import InvalidDimensionsError, InvalidShapeError
 
 
@@ -50,6 +60,30 @@ class TestRectangle(unittest.TestCase):
         expected = (10, 20, 110, 70)
         self.assertEqual(bbox, expected)
     
+    def test_bounding_box_rotated(self):
+        """Test bounding box of rotated rectangles matches their corners"""
+        # A quarter turn about the center swaps the extents
+        rect = Rectangle(100, 50, rotation=90)
+        for value, expected in zip(rect.bounding_box(), (25, -25, 75, 75)):
+            self.assertAlmostEqual(value, expected)
+        
+        rect = Rectangle(100, 50, x=10, y=20, rotation=30)
+        corners = rect._get_corners()
+        expected = (min(c[0] for c in corners), min(c[1] for c in corners),
+                    max(c[0] for c in corners), max(c[1] for c in corners))
+        for value, corner_value in zip(rect.bounding_box(), expected):
+            self.assertAlmostEqual(value, corner_value)
+    
+    def test_quarter_turns_are_exact(self):
+        """Test quarter-turn rotations use exact cos/sin, keeping edges exact"""
+        for rotation in (90, 180, 270):
+            rect = Rectangle(100, 50, rotation=rotation)
+            extents = (25, -25, 75, 75) if rotation % 180 else (0, 0, 100, 50)
+            self.assertEqual(rect.bounding_box(), extents)
+        
+        # Quarter-turned pieces sharing an edge touch, so they overlap
+        self.assertTrue(Rectangle(100, 50, rotation=90).overlaps(Rectangle(100, 50, x=50, rotation=90)))
+    
     def test_contains_point(self):
         """Test point containment"""
         rect = Rectangle(100, 50, x=10, y=20)
@@ -67,6 +101,15 @@ class TestRectangle(unittest.TestCase):
         self.assertFalse(rect.contains_point(50, 10))
         self.assertFalse(rect.contains_point(50, 80))
     
+    def test_contains_points_matches_scalar(self):
+        """Test batched containment agrees with contains_point"""
+        xs = [10, 50, 110, 5, 60, 80]
+        ys = [20, 40, 70, 40, 0, 90]
+        for rotation in (0, 90, 30):
+            rect = Rectangle(100, 50, x=10, y=20, rotation=rotation)
+            expected = [rect.contains_point(x, y) for x, y in zip(xs, ys)]
+            self.assertEqual(rect.contains_points(xs, ys).tolist(), expected)
+    
     def test_fits_in_rectangle(self):
         """Test if rectangle fits in container"""
         rect = Rectangle(100, 50)
@@ -96,6 +139,43 @@ class TestRectangle(unittest.TestCase):
         
         rect.rotate(270)
         self.assertEqual(rect.rotation, 0)  # 360 % 360 = 0
+    
+    def test_rotation_drift_snaps_to_axis_aligned(self):
+        """Test accumulated rotation error lands back on the axis-aligned path"""
+        rect = Rectangle(100, 50, x=10, y=20)
+        rect.rotate(90)
+        self.assertNotEqual(rect.bounding_box(), (10, 20, 110, 70))
+        
+        for _ in range(2700):
+            rect.rotate(0.1)  # A full turn in steps that do not sum exactly
+        self.assertEqual(rect.rotation, 0)
+        self.assertEqual(rect.bounding_box(), (10, 20, 110, 70))
+        
+        # Direct assignment keeps the cached state in step too
+        rect.rotation = 90
+        self.assertAlmostEqual(rect.bounding_box()[2], 85)
+    
+    def test_copy(self):
+        """Test shallow copy produces an independent rectangle"""
+        rect = Rectangle(100, 50, x=10, y=20, rotation=90)
+        clone = copy.copy(rect)
+        self.assertIsNot(clone, rect)
+        self.assertEqual((clone.width, clone.height, clone.x, clone.y, clone.rotation),
+                         (100, 50, 10, 20, 90))
+        
+        clone.move(5, 5)
+        self.assertEqual((rect.x, rect.y), (10, 20))
+    
+    def test_pickle(self):
+        """Test slotted shapes round-trip through pickle and deepcopy"""
+        shapes = [Rectangle(100, 50, x=10, y=20, rotation=30), Circle(25, x=5, y=5),
+                  Polygon([(0, 0), (100, 0), (50, 100)], x=10, y=10, rotation=45)]
+        
+        for shape in shapes:
+            for clone in (pickle.loads(pickle.dumps(shape)), copy.deepcopy(shape)):
+                self.assertIs(type(clone), type(shape))
+                self.assertEqual(clone.bounding_box(), shape.bounding_box())
+                self.assertEqual(clone.area(), shape.area())
 
 
 class TestCircle(unittest.TestCase):
@@ -160,6 +240,10 @@ class TestCircle(unittest.TestCase):
         # Doesn't fit
         self.assertFalse(circle.fits_in_rectangle(90, 100))
         self.assertFalse(circle.fits_in_rectangle(100, 90))
+        
+        # Stock fit uses the same test
+        self.assertTrue(circle.fits_in_stock(100, 100))
+        self.assertFalse(circle.fits_in_stock(90, 100))
 
 
 class TestPolygon(unittest.TestCase):
@@ -196,6 +280,30 @@ class TestPolygon(unittest.TestCase):
         bbox = polygon.bounding_box()
         expected = (10, 20, 110, 70)
         self.assertEqual(bbox, expected)
+    
+    def test_fits_in_stock(self):
+        """Test polygons are never reported as fitting a stock sheet"""
+        polygon = Polygon([(0, 0), (10, 0), (10, 10)])
+        self.assertFalse(polygon.fits_in_stock(1000, 1000))
+    
+    def test_contains_point(self):
+        """Test ray casting on a concave polygon, scalar and vectorized"""
+        # L-shape with the top-right quadrant cut away
+        polygon = Polygon([(0, 0), (100, 0), (100, 50), (50, 50), (50, 100), (0, 100)])
+        
+        self.assertTrue(polygon.contains_point(25, 75))
+        self.assertTrue(polygon.contains_point(75, 25))
+        self.assertFalse(polygon.contains_point(75, 75))
+        self.assertFalse(polygon.contains_point(150, 25))
+        
+        xs = np.array([25, 75, 75, 150])
+        ys = np.array([75, 25, 75, 25])
+        np.testing.assert_array_equal(polygon.contains_points(xs, ys), [True, True, False, False])
+        
+        # Moving the polygon invalidates the cached vertices
+        polygon.x = 100
+        self.assertFalse(polygon.contains_point(25, 75))
+        self.assertTrue(polygon.contains_point(125, 75))
 
 
 class TestShapeOverlaps(unittest.TestCase):
@@ -215,6 +323,56 @@ class TestShapeOverlaps(unittest.TestCase):
         self.assertFalse(rect1.overlaps(rect3))
         self.assertFalse(rect3.overlaps(rect1))
     
+    def test_rectangle_overlap_axis_aligned_matches_sat(self):
+        """Test the axis-aligned fast path agrees with the rotated SAT path"""
+        rect1 = Rectangle(100, 50, x=0, y=0)
+        
+        # Touching edges count as overlap on both paths
+        touching = Rectangle(100, 50, x=100, y=0)
+        self.assertTrue(rect1.overlaps(touching))
+        
+        # A quarter turn about its center covers the same box via SAT
+        turned = Rectangle(50, 100, x=125, y=-25, rotation=90)
+        self.assertTrue(rect1.overlaps(turned))
+        
+        apart = Rectangle(100, 50, x=100.5, y=0)
+        self.assertFalse(rect1.overlaps(apart))
+    
+    def test_rectangle_overlap_matches_corner_sat(self):
+        """Test overlaps() agrees with SAT over raw (unnormalized) edge normals"""
+        def corner_sat(rect1, rect2):
+            corners1, corners2 = rect1._get_corners(), rect2._get_corners()
+            for corners in (corners1, corners2):
+                for i in range(4):
+                    (x1, y1), (x2, y2) = corners[i], corners[(i + 1) % 4]
+                    axis = (y1 - y2, x2 - x1)
+                    proj1 = [cx * axis[0] + cy * axis[1] for cx, cy in corners1]
+                    proj2 = [cx * axis[0] + cy * axis[1] for cx, cy in corners2]
+                    if max(proj1) < min(proj2) or max(proj2) < min(proj1):
+                        return False
+            return True
+        
+        rng = random.Random(7)
+        for _ in range(500):
+            rect1, rect2 = (Rectangle(rng.uniform(5, 100), rng.uniform(5, 100),
+                                      x=rng.uniform(0, 150), y=rng.uniform(0, 150),
+                                      rotation=rng.uniform(1, 359)) for _ in range(2))
+            self.assertEqual(rect1.overlaps(rect2), corner_sat(rect1, rect2))
+    
+    def test_rectangle_batch_overlap_matches_scalar(self):
+        """Test the batched overlap matrix agrees with pairwise overlaps()"""
+        rects_a = [Rectangle(100, 50, x=0, y=0), Rectangle(40, 40, x=300, y=300, rotation=30)]
+        rects_b = [Rectangle(100, 50, x=100, y=0),  # Touching
+                   Rectangle(50, 100, x=125, y=-25, rotation=90),
+                   Rectangle(100, 50, x=100.5, y=0),
+                   Rectangle(30, 30, x=320, y=320, rotation=45)]
+        
+        matrix = Rectangle.batch_overlap(rects_a, rects_b)
+        self.assertEqual(matrix.shape, (2, 4))
+        for i, rect_a in enumerate(rects_a):
+            for j, rect_b in enumerate(rects_b):
+                self.assertEqual(bool(matrix[i, j]), rect_a.overlaps(rect_b))
+    
     def test_circle_overlap(self):
         """Test circle-circle overlap"""
         circle1 = Circle(50, x=0, y=0)
@@ -226,6 +384,219 @@ class TestShapeOverlaps(unittest.TestCase):
         # No overlap
         circle3 = Circle(50, x=150, y=0)
         self.assertFalse(circle1.overlaps(circle3))
+    
+    def test_circle_rectangle_overlap(self):
+        """Test circle-rectangle overlap, including rotated rectangles"""
+        rect = Rectangle(100, 50, x=0, y=0)
+        self.assertTrue(Circle(10, x=50, y=25).overlaps(rect))  # Center inside
+        self.assertTrue(Circle(10, x=110, y=25).overlaps(rect))  # Tangent to an edge
+        self.assertFalse(Circle(10, x=110.5, y=25).overlaps(rect))
+        self.assertTrue(rect.overlaps(Circle(5, x=103, y=54)))  # Near a corner
+        self.assertFalse(rect.overlaps(Circle(5, x=104, y=54)))
+        
+        # Turned 90 degrees about its center the rectangle spans x 25..75
+        rotated = Rectangle(100, 50, x=0, y=0, rotation=90)
+        self.assertFalse(Circle(10, x=90, y=25).overlaps(rotated))
+        self.assertTrue(Circle(10, x=80, y=25).overlaps(rotated))
+
+
+
+class TestShapeArray(unittest.TestCase):
+    """Test bulk geometry queries over shape columns"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.shapes = [
+            Rectangle(100, 50, x=0, y=0),
+            Rectangle(100, 50, x=100, y=0),  # Touching the first
+            Rectangle(50, 100, x=300, y=0, rotation=30),
+            Circle(20, x=150, y=60),
+            Polygon([(0, 0), (40, 0), (20, 30)], x=500, y=500)
+        ]
+        self.array = ShapeArray.from_shapes(self.shapes)
+    
+    def test_aabb_matches_bounding_box(self):
+        """Test column bounding boxes match each shape's bounding_box()"""
+        boxes = self.array.aabb()
+        for i, shape in enumerate(self.shapes):
+            for column, expected in zip(boxes, shape.bounding_box()):
+                self.assertAlmostEqual(column[i], expected)
+    
+    def test_overlap_mask_matches_overlaps(self):
+        """Test bulk overlap results match pairwise overlaps()"""
+        js = range(len(self.shapes))
+        for i, shape in enumerate(self.shapes):
+            expected = [shape.overlaps(other) for other in self.shapes]
+            self.assertEqual(self.array.overlap_mask(i, js).tolist(), expected)
+    
+    def test_overlap_pairs_matches_overlaps(self):
+        """Test one call over every index pair matches pairwise overlaps()"""
+        n = len(self.shapes)
+        idx_a, idx_b = np.divmod(np.arange(n * n), n)
+        expected = [self.shapes[a].overlaps(self.shapes[b]) for a, b in zip(idx_a, idx_b)]
+        self.assertEqual(self.array.overlap_pairs(idx_a, idx_b).tolist(), expected)
+    
+    def test_overlap_pairs_touching_rotated(self):
+        """Test rotated rectangles sharing an edge resolve exactly as overlaps() does"""
+        rng = random.Random(4)
+        rects = []
+        for _ in range(300):
+            rotation = rng.choice([90, 180, 270, 45, 30, rng.uniform(0, 360)])
+            width, height = round(rng.uniform(1, 200), 2), round(rng.uniform(1, 200), 2)
+            rect = Rectangle(width, height, x=round(rng.uniform(0, 500), 2),
+                             y=round(rng.uniform(0, 500), 2), rotation=rotation)
+            # Shift a copy one full width or height along one of its local axes
+            cos_r, sin_r = rect._rotation_trig()
+            ux, uy, distance = rng.choice([(cos_r, sin_r, width), (-sin_r, cos_r, height),
+                                           (-cos_r, -sin_r, width), (sin_r, -cos_r, height)])
+            rects += [rect, Rectangle(width, height, x=rect.x + ux * distance,
+                                      y=rect.y + uy * distance, rotation=rotation)]
+        
+        array = ShapeArray.from_shapes(rects)
+        idx_a = np.arange(0, len(rects), 2)
+        expected = [rects[i].overlaps(rects[i + 1]) for i in idx_a]
+        self.assertEqual(array.overlap_pairs(idx_a, idx_a + 1).tolist(), expected)
+    
+    def test_aabb_pairs_matches_masks(self):
+        """Test the pairwise box matrix matches per-shape box masks"""
+        pairs = self.array.aabb_pairs()
+        self.assertEqual(pairs.shape, (5, 5))
+        self.assertTrue(pairs[0, 1])  # Touching boxes meet
+        self.assertFalse(pairs[0, 4])
+        for i in range(len(self.shapes)):
+            self.assertEqual(pairs[i].tolist(), self.array.aabb_overlap_mask(i).tolist())
+        
+        np.testing.assert_array_equal(
+            aabb_overlap_matrix([[0, 0, 10, 10]], [[10, 0, 20, 10], [10.5, 0, 20, 10]]), [[True, False]])
+    
+    def test_cuda_detected_lazily(self):
+        """Test importing core leaves numba.cuda unloaded until a GPU-sized batch"""
+        code = ("import sys, numpy as np\n"
+                "import surface_optimizer.core\n"
+                "from surface_optimizer.core import _geom_cuda\n"
+                "print('numba.cuda' in sys.modules)\n"
+                "n = _geom_cuda.GPU_MIN_PAIRS\n"
+                "ones, zeros, idx = np.ones(4), np.zeros(4), np.zeros(n, dtype=np.int64)\n"
+                "print(_geom_cuda.rect_overlap_pairs_gpu(zeros, zeros, ones, zeros, ones, ones, idx, idx).all())\n")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split()[-2:], ["False", "True"])
+    
+    def test_float32_columns_agree_within_grid_tolerance(self):
+        """Test float32 columns only disagree with float64 on near-touching pairs"""
+        def sat_gap(rect1, rect2):
+            # Largest separation over the four local axes; > 0 means disjoint
+            (cos1, sin1), (cos2, sin2) = rect1._rotation_trig(), rect2._rotation_trig()
+            dx = (rect2.x + rect2.width / 2) - (rect1.x + rect1.width / 2)
+            dy = (rect2.y + rect2.height / 2) - (rect1.y + rect1.height / 2)
+            gaps = []
+            for ux, uy in ((cos1, sin1), (-sin1, cos1), (cos2, sin2), (-sin2, cos2)):
+                radius1 = rect1.width / 2 * abs(ux * cos1 + uy * sin1) + rect1.height / 2 * abs(uy * cos1 - ux * sin1)
+                radius2 = rect2.width / 2 * abs(ux * cos2 + uy * sin2) + rect2.height / 2 * abs(uy * cos2 - ux * sin2)
+                gaps.append(abs(ux * dx + uy * dy) - radius1 - radius2)
+            return max(gaps)
+        
+        # Inputs snapped to a 0.01 mm grid, dense enough to produce touching pairs
+        rng = random.Random(11)
+        snap = lambda value: round(value, 2)
+        rects = [Rectangle(snap(rng.uniform(5, 80)), snap(rng.uniform(5, 80)),
+                           x=snap(rng.uniform(0, 400)), y=snap(rng.uniform(0, 400)),
+                           rotation=rng.choice([0, 0, 90, 45, rng.uniform(0, 360)])) for _ in range(150)]
+        
+        exact = ShapeArray.from_shapes(rects)
+        single = ShapeArray.from_shapes(rects, dtype=np.float32)
+        self.assertEqual(single.cx.dtype, np.float32)
+        
+        js = np.arange(len(rects))
+        for i in range(len(rects)):
+            disagree = exact.overlap_mask(i, js) != single.overlap_mask(i, js)
+            for j in np.flatnonzero(disagree):
+                self.assertLess(abs(sat_gap(rects[i], rects[j])), 0.01)
+
+
+class TestStockTable(unittest.TestCase):
+    """Test bulk stock matching against Order.can_be_fulfilled_by_stock"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        rng = random.Random(7)
+        materials = [MaterialType.GLASS, MaterialType.WOOD, MaterialType.METAL]
+        self.stocks = [Stock(f"S{i}", rng.choice([100, 200, 300]), rng.choice([100, 200, 300]),
+                             thickness=rng.choice([4.0, 6.0, 8.0]), material_type=rng.choice(materials))
+                       for i in range(30)]
+        shapes = [lambda: Rectangle(rng.choice([50, 100, 200, 300]), rng.choice([50, 100, 200])),
+                  lambda: Rectangle(150, 60, rotation=rng.choice([30, 90])),
+                  lambda: Circle(rng.choice([25, 50, 100])),
+                  lambda: Polygon([(0, 0), (40, 0), (20, 30)])]
+        self.orders = [Order(f"O{i}", rng.choice(shapes)(), material_type=rng.choice(materials),
+                             thickness=rng.choice([4.0, 6.0, 7.5, 8.0]), tolerance=rng.choice([0.0, 1.0, 2.5]))
+                       for i in range(40)]
+        self.table = StockTable.from_list(self.stocks)
+    
+    def expected(self, available_only=False):
+        """Per-object reference mask, one row per order"""
+        return [[order.can_be_fulfilled_by_stock(stock) and
+                 (not available_only or stock.is_available)
+                 for stock in self.stocks] for order in self.orders]
+    
+    def test_matches_order_matches_per_object_check(self):
+        """Test matches_order and candidates_for agree with the per-stock check"""
+        for order, expected in zip(self.orders, self.expected()):
+            self.assertEqual(self.table.matches_order(order).tolist(), expected)
+            self.assertEqual(self.table.candidates_for(order),
+                             [stock for stock, fits in zip(self.stocks, expected) if fits])
+    
+    def test_match_matrix_matches_per_object_check(self):
+        """Test the numba and broadcast match_matrix paths agree with the per-stock check"""
+        for numba_path in (True, False):
+            with self.subTest(numba=numba_path), \
+                    mock.patch("surface_optimizer.core.stock_table.NUMBA_AVAILABLE", numba_path):
+                self.assertEqual(self.table.match_matrix(self.orders).tolist(), self.expected())
+    
+    def test_available_only_after_reserve(self):
+        """Test reserved stocks drop out of available_only matches"""
+        for index in range(0, len(self.stocks), 3):
+            self.assertTrue(self.table.reserve(index))
+        self.assertFalse(self.table.reserve(0))  # Already reserved
+        
+        expected = self.expected(available_only=True)
+        for order, row in zip(self.orders, expected):
+            self.assertEqual(self.table.matches_order(order, available_only=True).tolist(), row)
+        for numba_path in (True, False):
+            with self.subTest(numba=numba_path), \
+                    mock.patch("surface_optimizer.core.stock_table.NUMBA_AVAILABLE", numba_path):
+                self.assertEqual(self.table.match_matrix(self.orders, available_only=True).tolist(),
+                                 expected)
+        
+        self.assertTrue(self.table.release(0))
+        self.assertEqual(self.table.matches_order(self.orders[0], available_only=True)[0],
+                         self.orders[0].can_be_fulfilled_by_stock(self.stocks[0]))
+    
+    def test_masks_are_read_only(self):
+        """Test callers cannot write through the shared masks, which still follow reserve"""
+        available = self.table.available()
+        with self.assertRaises(ValueError):
+            available &= False
+        with self.assertRaises(ValueError):
+            self.table.with_material(MaterialType.GLASS)[0] = True
+        
+        self.assertTrue(available[0])
+        self.table.reserve(0)
+        self.assertFalse(available[0])
+        self.assertEqual(self.table.available().tolist(), [stock.is_available for stock in self.stocks])
+    
+    def test_empty_inputs(self):
+        """Test empty order and stock lists give empty masks of the right shape"""
+        self.assertEqual(self.table.match_matrix([]).shape, (0, len(self.stocks)))
+        
+        empty = StockTable.from_list([])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.matches_order(self.orders[0]).shape, (0,))
+        self.assertEqual(empty.candidates_for(self.orders[0]), [])
+        for numba_path in (True, False):
+            with self.subTest(numba=numba_path), \
+                    mock.patch("surface_optimizer.core.stock_table.NUMBA_AVAILABLE", numba_path):
+                self.assertEqual(empty.match_matrix(self.orders).shape, (len(self.orders), 0))
+                self.assertEqual(empty.match_matrix([], available_only=True).shape, (0, 0))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for core models
+"""
+
+import unittest
+import json
+import os
+import tempfile
+from datetime import datetime
+from unittest import mock
+import numpy as np
+from surface_optimizer.core import models
+from surface_optimizer.core.models import CuttingResult, PlacedShape
+from surface_optimizer.core.geometry import Rectangle
+
+
+class TestExportSummary(unittest.TestCase):
+    """Test JSON export of cutting results"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        now = datetime(2026, 1, 2, 3, 4, 5)
+        self.result = CuttingResult(algorithm_used="Bottom-Left", total_stock_used=1,
+                                    optimization_date=now)
+        self.result.add_placed(PlacedShape.build("O1_1", Rectangle(100, 50), "S1", now))
+        self.result.add_placed(PlacedShape.build("O1_2", Rectangle(100, 50, y=50), "S1", now, 90.0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "summary.json")
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def backends(self):
+        """ORJSON_AVAILABLE settings to run under: stdlib json, plus orjson when installed"""
+        return [False, True] if models.ORJSON_AVAILABLE else [False]
+    
+    def test_round_trip(self):
+        """Test both encoders write the same loadable document"""
+        self.result.metadata = {1: "a", "sizes": np.arange(3), "scale": np.float64(1.5),
+                                "started": datetime(2026, 1, 2, 3, 0, 0)}
+        documents = []
+        for use_orjson in self.backends():
+            with self.subTest(orjson=use_orjson), \
+                    mock.patch.object(models, "ORJSON_AVAILABLE", use_orjson):
+                self.result.export_summary(self.path)
+                with open(self.path) as f:
+                    document = json.load(f)
+                
+                self.assertEqual(document["algorithm_used"], "Bottom-Left")
+                self.assertEqual(document["optimization_date"], "2026-01-02T03:04:05")
+                self.assertEqual(document["stocks_used"], 1)
+                self.assertEqual([shape["order_id"] for shape in document["placed_shapes"]],
+                                 ["O1_1", "O1_2"])
+                self.assertEqual(document["placed_shapes"][1]["rotation_applied"], 90.0)
+                self.assertEqual(document["placed_shapes"][1]["position"], [0, 50])
+                self.assertEqual(document["metadata"], {"1": "a", "sizes": [0, 1, 2], "scale": 1.5,
+                                                        "started": "2026-01-02T03:00:00"})
+                documents.append(document)
+        
+        self.assertTrue(all(document == documents[0] for document in documents))
+    
+    def test_failed_export_keeps_previous_file(self):
+        """Test an unencodable value leaves the previous export in place and no partial file"""
+        self.result.export_summary(self.path)
+        with open(self.path, 'rb') as f:
+            previous = f.read()
+        
+        self.result.metadata = {"bad": object()}
+        for use_orjson in self.backends():
+            with self.subTest(orjson=use_orjson), \
+                    mock.patch.object(models, "ORJSON_AVAILABLE", use_orjson):
+                with self.assertRaises(TypeError):
+                    self.result.export_summary(self.path)
+                with open(self.path, 'rb') as f:
+                    self.assertEqual(f.read(), previous)
+                self.assertEqual(os.listdir(self.directory.name), ["summary.json"])
+
+
+class TestCuttingResultIndex(unittest.TestCase):
+    """Test the per-stock totals kept over placed shapes"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = datetime(2026, 1, 2)
+        self.result = CuttingResult()
+    
+    def placed(self, order_id, stock_id, width=10, height=10):
+        """A width x height rectangle placed on stock_id"""
+        return PlacedShape.build(order_id, Rectangle(width, height), stock_id, self.now)
+    
+    def assertIndexMatches(self, result):
+        """Index answers agree with a direct scan of placed_shapes"""
+        stock_ids = {ps.stock_id for ps in result.placed_shapes} | {"missing"}
+        self.assertAlmostEqual(result.total_area_used,
+                               sum(ps.shape.area() for ps in result.placed_shapes))
+        for stock_id in stock_ids:
+            on_stock = [ps for ps in result.placed_shapes if ps.stock_id == stock_id]
+            self.assertEqual(result.get_shapes_by_stock(stock_id), on_stock)
+            self.assertAlmostEqual(result.get_stock_used_area(stock_id),
+                                   sum(ps.shape.area() for ps in on_stock))
+    
+    def test_add_placed(self):
+        """Test add_placed and add_placed_shapes keep the totals current"""
+        self.result.add_placed(self.placed("O1_1", "S1"))
+        self.assertEqual(self.result.get_stock_used_area("S1"), 100)
+        self.assertEqual(self.result.get_stock_used_area("S2"), 0.0)
+        
+        self.result.add_placed_shapes([self.placed("O2_1", "S2", 20, 5), self.placed("O1_2", "S1")])
+        self.assertEqual(self.result.total_area_used, 300)
+        self.assertEqual([ps.order_id for ps in self.result.get_shapes_by_stock("S1")],
+                         ["O1_1", "O1_2"])
+        self.assertIndexMatches(self.result)
+    
+    def test_list_appends_and_replacement(self):
+        """Test appends to the list, a new list and a shorter list are all picked up"""
+        self.result.add_placed(self.placed("O1_1", "S1"))
+        self.result.placed_shapes.append(self.placed("O1_2", "S2"))
+        self.assertIndexMatches(self.result)
+        
+        # Moving a placement means assigning a new list
+        self.result.placed_shapes = [self.placed("O1_1", "S2"), self.result.placed_shapes[1]]
+        self.assertEqual(self.result.get_stock_used_area("S1"), 0.0)
+        self.assertEqual(self.result.get_stock_used_area("S2"), 200)
+        
+        self.result.placed_shapes.pop()
+        self.assertIndexMatches(self.result)
+        
+        self.result.placed_shapes = []
+        self.assertEqual(self.result.total_area_used, 0.0)
+        self.assertEqual(self.result.get_shapes_by_stock("S2"), [])
+    
+    def test_constructed_with_shapes(self):
+        """Test shapes passed to the constructor are indexed on first query"""
+        shapes = [self.placed(f"O{i}_1", f"S{i % 3}", 10 + i, 5) for i in range(12)]
+        result = CuttingResult(placed_shapes=shapes)
+        self.assertIndexMatches(result)
+
+
+if __name__ == '__main__':
+    unittest.main()